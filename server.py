@@ -1,16 +1,32 @@
+import os
 import sys
 import traceback
 import json
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
 
+import anyio
 from mcp.server.fastmcp import FastMCP
-from util.db.core import execute_database_query
+from util.db import admission, profiles
+from util.db.core import execute_database_query, analyze_redis_keyspace, get_query_stats
 import requests
 
+# HTTP 요청 타임아웃(초)
+HTTP_TIMEOUT = 30
+
+@asynccontextmanager
+async def lifespan(server):
+    """서버가 시작되면 첫 요청을 기다리지 않고 백그라운드에서 연결 프로필을 예열"""
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(profiles.warmup_all)
+        yield
+        tg.cancel_scope.cancel()
+
 # MCP 서버 생성
-mcp = FastMCP("mcp_project")
+mcp = FastMCP("mcp_project", lifespan=lifespan)
 
 @mcp.tool()
-def test_server(method: str, url: str, body, access_token: str) -> str:
+async def test_server(method: str, url: str, body, access_token: str) -> str:
     """
     HTTP 요청을 보내 API 서버를 테스트하는 도구입니다.
 
@@ -44,12 +60,26 @@ def test_server(method: str, url: str, body, access_token: str) -> str:
    - 모든 요청에서 body 파라미터는 필수이며, 데이터가 없는 GET 요청에도 빈 객체 "{}"를 전달해야 합니다.
    - JSON 응답이 아닌 경우 {"response": "텍스트 응답"} 형식으로 반환됩니다.
    - HTTP 상태 코드가 4xx 또는 5xx인 경우 예외가 발생하여 오류 메시지가 반환됩니다.
+   - 같은 호스트로의 동시 요청 수가 제한되며, 연결 오류가 계속되면 일정 시간 동안 즉시 실패합니다.
     :param method:
     :param url:
     :param body:
     :param access_token:
     :return:
     """
+    parsed_url = urlsplit(url)
+    # URL에 포함된 인증 정보(user:password@)는 통계와 오류 메시지에 드러나지 않도록 제외
+    location = parsed_url.netloc.rsplit("@", 1)[-1]
+
+    try:
+        # 실행 슬롯은 이벤트 루프에서 기다리고, 허용된 요청만 워커 스레드에서 전송
+        async with admission.admit(f"{parsed_url.scheme}://{location}") as ticket:
+            return await anyio.to_thread.run_sync(_send_request, method, url, body, access_token, ticket)
+    except admission.AdmissionError as e:
+        return json.dumps({"error": str(e)})
+
+def _send_request(method: str, url: str, body, access_token: str, ticket) -> str:
+    """HTTP 요청을 보내고 결과를 반환 (연결 오류는 ticket에 기록)"""
     headers = {"Content-Type": "application/json"}
 
     if access_token:
@@ -61,7 +91,11 @@ def test_server(method: str, url: str, body, access_token: str) -> str:
         else:
             json_body = body
 
-        response = requests.request(method, url, headers=headers, json=json_body)
+        try:
+            response = requests.request(method, url, headers=headers, json=json_body, timeout=HTTP_TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout):
+            ticket.fail()
+            raise
         response.raise_for_status()
 
         try:
@@ -74,22 +108,48 @@ def test_server(method: str, url: str, body, access_token: str) -> str:
 
 # 통합 데이터베이스 쿼리 도구
 @mcp.tool()
-def db_query(db_type: str, connection_params: dict, query: str, params=None, options=None) -> str:
+async def db_query(db_type: str = "", connection_params: dict = None, query: str = "", params=None, options=None, profile: str = "") -> str:
     """
     여러 데이터베이스 시스템에서 쿼리를 실행하고 결과를 반환합니다.
     
     Args:
         db_type: 데이터베이스 유형 ('mysql', 'postgresql', 'oracle', 'mongodb', 'redis')
+            - profile을 지정한 경우 생략
         connection_params: 데이터베이스 연결 정보
+            - profile을 지정한 경우 생략
         query: 실행할 쿼리 또는 명령어
         params: 쿼리 파라미터 (선택 사항)
         options: 추가 옵션 (선택 사항)
+            - max_rows: 최대 반환 행 수 (기본값 1000)
+            - max_bytes: 최대 반환 결과 크기(바이트) (기본값 1048576)
+            - max_field_length: 문자열/바이너리 필드의 최대 길이(문자 수) (기본값 자르지 않음)
+            - singleflight: 동시에 들어온 동일한 읽기 쿼리의 실행을 공유 (기본값 True)
+            - queue_timeout: 실행 슬롯을 기다리는 최대 시간(초) (기본값 대상 서버에 설정된 값, 10)
+              대상 서버에 설정된 값보다 짧게만 지정할 수 있습니다.
+            - 대상 서버별 동시 실행 수, 요청 속도 제한, 회로 차단기 설정은 서버의 프로필 설정으로만
+              지정할 수 있으며 요청 옵션으로는 바꿀 수 없습니다.
+        profile: 서버에 등록된 연결 프로필 이름 (선택 사항, db_profiles 도구로 목록 확인)
+            - 지정하면 프로필의 db_type, connection_params, options를 사용하며
+              options로 전달한 값이 프로필 옵션보다 우선합니다.
         
     Returns:
         쿼리 실행 결과 (JSON 문자열)
+        - 조회 결과에는 반환된 행 수(count)와 결과 크기(result_bytes),
+          max_bytes 도달 여부(max_bytes_reached), 잘린 필드 수(truncated_fields)와
+          잘려 나간 UTF-8 바이트 수(truncated_field_bytes)가 포함됩니다.
+        - max_bytes를 넘겨 반환하지 못한 첫 항목이 있으면 skipped_item에 그 크기와 가장 큰 필드가 담깁니다.
+        - MongoDB aggregate 등 커서를 반환하는 명령은 첫 배치의 문서를 results로 반환합니다.
     """
     try:
-        return execute_database_query(db_type, connection_params, query, params, options)
+        if profile:
+            db_type, connection_params, options = profiles.resolve(profile, options)
+        elif not db_type or connection_params is None:
+            raise ValueError("db_type and connection_params are required when profile is not given")
+
+        if not query:
+            raise ValueError("query is required")
+
+        return await execute_database_query(db_type, connection_params, query, params, options)
     except Exception as e:
         return json.dumps({
             "success": False,
@@ -97,6 +157,90 @@ def db_query(db_type: str, connection_params: dict, query: str, params=None, opt
             "error_type": type(e).__name__
         })
 
+@mcp.tool()
+async def redis_analyze(connection_params: dict = None, options=None, profile: str = "") -> str:
+    """
+    Redis 키스페이스를 SCAN으로 조금씩 훑으며 키 패턴별 메모리 사용량을 분석합니다.
+    키마다 명령을 보내지 않고 TYPE/MEMORY USAGE/TTL을 파이프라인으로 묶어 실행합니다.
+
+    Args:
+        connection_params: Redis 연결 정보 (profile을 지정한 경우 생략)
+        options: 분석 옵션 (선택 사항)
+            - match: SCAN 대상 키 패턴 (기본값 "*")
+            - patterns: 그룹으로 묶을 glob 패턴 목록, 먼저 일치하는 패턴 사용 (예: ["user:*", "session:*"])
+            - separator, depth: 패턴에 일치하지 않는 키를 묶을 접두사 구분자와 단위 수 (기본값 ":", 1)
+              구분자가 없는 키는 "<no-prefix>" 그룹으로 묶입니다.
+            - max_groups: 최대 그룹 수, 넘는 키는 "<other>" 그룹으로 집계 (기본값 1000)
+            - top_n: 반환할 상위 그룹 수 (기본값 20)
+            - sample_rate: 분석할 키의 비율 0~1 (기본값 1.0)
+            - time_budget: 최대 분석 시간(초) (기본값 10)
+            - batch_size: SCAN COUNT 및 파이프라인 배치 크기 (기본값 500)
+            - cursor: 이전 분석이 끝나지 않은 경우 반환된 cursor로 이어서 분석 (기본값 0)
+        profile: 서버에 등록된 Redis 연결 프로필 이름 (선택 사항)
+
+    Returns:
+        분석 결과 (JSON 문자열)
+        - complete: 키스페이스를 모두 훑었는지 여부 (false이면 cursor로 이어서 분석 가능)
+        - overflow_keys: max_groups를 넘어 "<other>" 그룹으로 집계된 키 수
+        - top_by_bytes, top_by_count: 그룹별 키 수, 바이트 수, 타입 분포, TTL 설정 키 수, 가장 큰 키,
+          샘플링 비율로 추정한 전체 키 수(estimated_count)와 바이트 수(estimated_bytes)
+    """
+    try:
+        if profile:
+            db_type, connection_params, options = profiles.resolve(profile, options)
+            if db_type != "redis":
+                raise ValueError(f"Profile '{profile}' is not a redis profile")
+        elif connection_params is None:
+            raise ValueError("connection_params is required when profile is not given")
+
+        return await analyze_redis_keyspace(connection_params, options)
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        })
+
+@mcp.tool()
+def db_stats() -> str:
+    """
+    데이터베이스 쿼리 실행 통계를 반환합니다.
+
+    Returns:
+        통계 정보 (JSON 문자열)
+        - singleflight.executed: 실제로 실행된 읽기 쿼리 수
+        - singleflight.coalesced: 진행 중인 동일 쿼리의 결과를 공유받은 호출 수
+        - singleflight.in_flight: 현재 실행 중인 고유 읽기 쿼리 수
+        - targets: 대상 서버별 회로 상태, 실행/대기 중인 요청 수, 거부된 요청 수
+    """
+    return json.dumps({
+        "success": True,
+        "stats": get_query_stats()
+    })
+
+@mcp.tool()
+def db_profiles() -> str:
+    """
+    서버에 등록된 데이터베이스 연결 프로필 목록을 반환합니다.
+
+    Returns:
+        프로필 목록 (JSON 문자열)
+        - 프로필별 db_type, host, port, database와 예열 상태(status)
+        - status.state: pending(예열 대기), warming(예열 중), ready(준비 완료), failed(실패), cold(예열 안 함)
+        - 비밀번호 등 인증 정보는 포함되지 않습니다.
+    """
+    return json.dumps({
+        "success": True,
+        "profiles": profiles.list_profiles()
+    })
+
+# 연결 프로필 로드 (예열은 서버 시작 시 lifespan에서 수행)
+# MCP 클라이언트가 임의의 작업 디렉터리에서 서버를 실행하므로 기본 설정 파일은 server.py 기준으로 찾음
+try:
+    profiles.load_profiles(default_path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "db_profiles.json"))
+except Exception:
+    traceback.print_exc(file=sys.stderr)
+
 if __name__ == "__main__":
     try:
         mcp.run()
@@ -0,0 +1,207 @@
+import time
+
+import anyio
+import pytest
+
+from util.db import admission
+
+
+def _configure(key, **overrides):
+    limits = dict(breaker_threshold=2, breaker_reset_timeout=0.05)
+    limits.update(overrides)
+    admission.configure({key: limits})
+    return key
+
+
+async def _fail(key):
+    async with admission.admit(key) as ticket:
+        ticket.fail()
+
+
+async def _succeed(key, queue_timeout=None):
+    async with admission.admit(key, queue_timeout):
+        pass
+
+
+def test_breaker_opens_after_consecutive_connection_errors():
+    key = _configure("test://open:1")
+
+    async def main():
+        await _fail(key)
+        await _fail(key)
+
+        with pytest.raises(admission.CircuitOpenError):
+            await _succeed(key)
+
+    anyio.run(main)
+
+
+def test_half_open_probe_closes_breaker():
+    key = _configure("test://probe:1")
+
+    async def main():
+        await _fail(key)
+        await _fail(key)
+
+        await anyio.sleep(0.06)
+        await _succeed(key)
+
+    anyio.run(main)
+
+    assert admission.get_stats()[key]["circuit"] == "closed"
+
+
+def test_stale_success_does_not_close_open_breaker():
+    key = _configure("test://stale:1")
+
+    async def main():
+        # 회로가 닫혀 있을 때 시작되어 회로가 열린 뒤에 끝나는 느린 요청
+        slow = admission.admit(key)
+        await slow.__aenter__()
+
+        await _fail(key)
+        await _fail(key)
+        assert admission.get_stats()[key]["circuit"] == "open"
+
+        await slow.__aexit__(None, None, None)
+
+        assert admission.get_stats()[key]["circuit"] == "open"
+        with pytest.raises(admission.CircuitOpenError):
+            await _succeed(key)
+
+    anyio.run(main)
+
+
+def test_failed_probe_reopens_breaker():
+    key = _configure("test://reopen:1")
+
+    async def main():
+        await _fail(key)
+        await _fail(key)
+
+        await anyio.sleep(0.06)
+        await _fail(key)
+
+        with pytest.raises(admission.CircuitOpenError):
+            await _succeed(key)
+
+    anyio.run(main)
+
+
+def test_queued_requests_do_not_hold_worker_threads():
+    key = _configure("test://queue:1", max_concurrency=1, queue_timeout=0.1)
+    rejected = []
+    borrowed = []
+
+    async def holder():
+        async with admission.admit(key):
+            await anyio.sleep(0.3)
+
+    async def waiter():
+        try:
+            await _succeed(key)
+        except admission.AdmissionError:
+            rejected.append(1)
+
+    async def main():
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(holder)
+            await anyio.sleep(0.01)
+            for _ in range(50):
+                tg.start_soon(waiter)
+            await anyio.sleep(0.05)
+            borrowed.append(anyio.to_thread.current_default_thread_limiter().borrowed_tokens)
+            borrowed.append(admission.get_stats()[key]["waiting"])
+
+    anyio.run(main)
+
+    assert borrowed == [0, 50]
+    assert len(rejected) == 50
+
+
+def test_rate_limit_rejects_when_token_cannot_arrive_in_time():
+    key = _configure("test://rate:1", rate_limit=1, rate_burst=1, queue_timeout=0.1)
+
+    async def main():
+        await _succeed(key)
+
+        started = time.monotonic()
+        with pytest.raises(admission.AdmissionError):
+            await _succeed(key)
+        assert time.monotonic() - started < 0.05
+
+    anyio.run(main)
+
+
+@pytest.mark.parametrize("limits", [
+    {"max_concurrency": 0},
+    {"max_concurrency": 1.5},
+    {"rate_limit": 0},
+    {"rate_burst": -1},
+    {"queue_timeout": 0},
+    {"breaker_threshold": 0},
+    {"breaker_reset_timeout": -5},
+    {"unknown": 1},
+])
+def test_invalid_limits_are_rejected(limits):
+    with pytest.raises(ValueError):
+        admission.configure({"test://invalid:1": limits})
+
+
+def test_request_queue_timeout_can_only_shorten_configured_wait():
+    key = _configure("test://shorten:1", max_concurrency=1, queue_timeout=0.05)
+    rejected = []
+
+    async def holder():
+        async with admission.admit(key):
+            await anyio.sleep(0.3)
+
+    async def main():
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(holder)
+            await anyio.sleep(0.01)
+
+            started = time.monotonic()
+            with pytest.raises(admission.AdmissionError):
+                await _succeed(key, queue_timeout=60)
+            rejected.append(time.monotonic() - started)
+
+    anyio.run(main)
+
+    assert rejected[0] < 0.2
+
+
+def test_request_options_cannot_change_target_limits():
+    from util.db import core
+
+    async def main():
+        # 요청 옵션의 제한 항목은 무시되어 다른 요청에 영향을 주지 않음
+        await core.execute_database_query(
+            "sqlite", {"host": "shared-host"}, "SELECT 1", None,
+            {"max_concurrency": 0, "breaker_threshold": 1, "breaker_reset_timeout": 3600}
+        )
+        async with admission.admit(admission.target_key("sqlite", {"host": "shared-host"}), 0.1):
+            pass
+
+    anyio.run(main)
+
+
+def test_cancelled_probe_releases_half_open_slot():
+    key = _configure("test://cancel-probe:1", rate_limit=1, rate_burst=1, queue_timeout=5)
+
+    async def main():
+        await _fail(key)
+        await _fail(key)
+        await anyio.sleep(0.06)
+
+        # 확인 요청이 토큰을 기다리는 동안 취소됨
+        with anyio.move_on_after(0.05):
+            await _succeed(key)
+        assert admission.get_stats()[key]["circuit"] == "half_open"
+
+        await anyio.sleep(1)
+        await _succeed(key)
+
+    anyio.run(main)
+
+    assert admission.get_stats()[key]["circuit"] == "closed"
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+pymongo = pytest.importorskip("pymongo")
+
+from util.db.mongodb_handler import handle_mongodb_query
+
+
+class FakeDatabase:
+    def __init__(self, reply):
+        self.reply = reply
+
+    def command(self, command):
+        return self.reply
+
+
+class FakeClient:
+    reply = {}
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getitem__(self, name):
+        return FakeDatabase(self.reply)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    monkeypatch.setattr(pymongo, "MongoClient", FakeClient)
+    return FakeClient
+
+
+def _command(command, **options):
+    options = {"timeout": 1, "max_rows": 1000, "max_bytes": 2000, **options}
+    return json.loads(handle_mongodb_query({}, json.dumps(command), None, options))
+
+
+def test_aggregate_first_batch_is_serialized_within_budget(fake_client):
+    fake_client.reply = {"cursor": {"id": 0, "firstBatch": [{"n": i, "s": "x" * 100} for i in range(101)]}, "ok": 1}
+
+    result = _command({"aggregate": "docs", "pipeline": [], "cursor": {}})
+
+    assert result["success"]
+    assert result["max_bytes_reached"]
+    assert 0 < result["count"] < 101
+
+
+def test_command_result_is_serialized_within_budget(fake_client):
+    fake_client.reply = {"ok": 1, "big": "x" * 5000}
+
+    result = _command({"buildInfo": 1})
+
+    assert result["result"] == {"ok": 1}
+    assert result["skipped_item"]["largest_field"] == "big"
@@ -0,0 +1,132 @@
+import json
+import sys
+import types
+
+from util.db.mysql_handler import handle_mysql_query
+
+
+class FakeError(Exception):
+    pass
+
+
+class FakeInternalError(FakeError):
+    pass
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = -1
+
+    def execute(self, query, params=None):
+        self.remaining = list(self.conn.rows)
+
+    def fetchmany(self, size):
+        batch, self.remaining = self.remaining[:size], self.remaining[size:]
+        return batch
+
+    def close(self):
+        # mysql.connector와 같이 읽지 않은 결과가 남아 있으면 오류
+        if self.remaining:
+            raise FakeInternalError("Unread result found")
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.cursors = []
+        self.disconnected = False
+
+    @property
+    def unread_result(self):
+        return any(cursor.remaining for cursor in self.cursors)
+
+    def cursor(self, dictionary=False):
+        cursor = FakeCursor(self)
+        cursor.remaining = []
+        self.cursors.append(cursor)
+        return cursor
+
+    def disconnect(self):
+        self.disconnected = True
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _install_fake_connector(monkeypatch, rows):
+    connector = types.ModuleType("mysql.connector")
+    connector.Error = FakeError
+    conn = FakeConnection(rows)
+    connector.connect = lambda **kwargs: conn
+    mysql = types.ModuleType("mysql")
+    mysql.connector = connector
+
+    monkeypatch.setitem(sys.modules, "mysql", mysql)
+    monkeypatch.setitem(sys.modules, "mysql.connector", connector)
+    return conn
+
+
+def test_stopping_mid_result_on_byte_budget_returns_partial_result(monkeypatch):
+    conn = _install_fake_connector(monkeypatch, [{"id": i, "body": "x" * 1000} for i in range(500)])
+
+    result = json.loads(handle_mysql_query({}, "SELECT * FROM docs", None, {
+        "timeout": 1, "max_rows": 1000, "max_bytes": 20000
+    }))
+
+    assert result["success"]
+    assert result["max_bytes_reached"]
+    assert 0 < result["count"] < 500
+    # 남은 행을 서버에서 읽어 버리지 않고 연결을 끊음
+    assert conn.disconnected
+    assert len(conn.cursors[0].remaining) > 300
+
+
+def test_fully_read_result_closes_normally(monkeypatch):
+    conn = _install_fake_connector(monkeypatch, [{"id": i} for i in range(5)])
+
+    result = json.loads(handle_mysql_query({}, "SELECT id FROM docs", None, {
+        "timeout": 1, "max_rows": 1000, "max_bytes": None
+    }))
+
+    assert result["count"] == 5
+    assert not conn.disconnected
+
+
+def test_stopping_mid_result_on_max_rows_returns_partial_result(monkeypatch):
+    _install_fake_connector(monkeypatch, [{"id": i} for i in range(500)])
+
+    result = json.loads(handle_mysql_query({}, "SELECT id FROM docs", None, {
+        "timeout": 1, "max_rows": 10, "max_bytes": None
+    }))
+
+    assert result["success"]
+    assert result["count"] == 10
+    assert result["max_rows_reached"]
+
+
+def _connect_error(monkeypatch, errno):
+    _install_fake_connector(monkeypatch, [])
+    error = FakeError("connect failed")
+    error.errno = errno
+
+    def connect(**kwargs):
+        raise error
+
+    monkeypatch.setattr(sys.modules["mysql.connector"], "connect", connect)
+    return json.loads(handle_mysql_query({}, "SELECT 1", None, {"timeout": 1, "max_rows": 10}))
+
+
+def test_unreachable_server_is_connection_error(monkeypatch):
+    assert _connect_error(monkeypatch, 2003)["connection_error"]
+
+
+def test_access_denied_and_unknown_database_are_not_connection_errors(monkeypatch):
+    assert not _connect_error(monkeypatch, 1045)["connection_error"]
+    assert not _connect_error(monkeypatch, 1049)["connection_error"]
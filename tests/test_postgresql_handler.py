@@ -0,0 +1,118 @@
+import json
+import sys
+import types
+
+from util.db.postgresql_handler import handle_postgresql_query
+
+
+class FakeError(Exception):
+    pgcode = None
+
+
+class FakeOperationalError(FakeError):
+    pass
+
+
+class FakeCursor:
+    def __init__(self, conn, name):
+        self.conn = conn
+        self.name = name
+        self.itersize = 2000
+        self.rowcount = -1
+        self.closed = False
+
+    def execute(self, query, params=None):
+        self.remaining = list(self.conn.rows)
+
+    def fetchmany(self, size):
+        self.conn.fetched.append(size)
+        batch, self.remaining = self.remaining[:size], self.remaining[size:]
+        return batch
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.fetched = []
+        self.cursors = []
+
+    def cursor(self, name=None, cursor_factory=None):
+        cursor = FakeCursor(self, name)
+        self.cursors.append(cursor)
+        return cursor
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _install_fake_psycopg2(monkeypatch, conn):
+    psycopg2 = types.ModuleType("psycopg2")
+    psycopg2.Error = FakeError
+    psycopg2.OperationalError = FakeOperationalError
+    psycopg2.connect = lambda **kwargs: conn
+    extras = types.ModuleType("psycopg2.extras")
+    extras.RealDictCursor = object
+    psycopg2.extras = extras
+
+    monkeypatch.setitem(sys.modules, "psycopg2", psycopg2)
+    monkeypatch.setitem(sys.modules, "psycopg2.extras", extras)
+
+
+def test_select_uses_server_side_cursor_and_stops_on_byte_budget(monkeypatch):
+    conn = FakeConnection([{"id": i, "body": "x" * 1000} for i in range(10000)])
+    _install_fake_psycopg2(monkeypatch, conn)
+
+    result = json.loads(handle_postgresql_query({}, "SELECT * FROM docs", None, {
+        "timeout": 1, "max_rows": 10000, "max_bytes": 50000
+    }))
+
+    assert result["success"]
+    assert result["max_bytes_reached"]
+    assert 0 < result["count"] < 100
+    assert conn.cursors[0].name is not None
+    assert conn.cursors[0].itersize == 100
+    # 예산에 도달한 뒤에는 더 이상 서버에서 가져오지 않음
+    assert len(conn.fetched) == 1
+
+
+def test_non_select_uses_client_cursor(monkeypatch):
+    conn = FakeConnection([])
+    _install_fake_psycopg2(monkeypatch, conn)
+
+    result = json.loads(handle_postgresql_query({}, "DELETE FROM docs", None, {"timeout": 1, "max_rows": 10}))
+
+    assert result["success"]
+    assert conn.cursors[0].name is None
+
+
+def _connect_error(monkeypatch, message):
+    _install_fake_psycopg2(monkeypatch, None)
+
+    def connect(**kwargs):
+        raise FakeOperationalError(message)
+
+    monkeypatch.setattr(sys.modules["psycopg2"], "connect", connect)
+    return json.loads(handle_postgresql_query({}, "SELECT 1", None, {"timeout": 1, "max_rows": 10}))
+
+
+def test_refused_connection_is_connection_error(monkeypatch):
+    result = _connect_error(monkeypatch, 'connection to server at "db" (10.0.0.1), port 5432 failed: Connection refused')
+
+    assert result["connection_error"]
+
+
+def test_authentication_failure_is_not_connection_error(monkeypatch):
+    result = _connect_error(monkeypatch, 'connection to server at "db" (10.0.0.1), port 5432 failed: '
+                                         'FATAL:  password authentication failed for user "app"')
+
+    assert not result["connection_error"]
+    assert not _connect_error(monkeypatch, 'FATAL:  database "missing" does not exist')["connection_error"]
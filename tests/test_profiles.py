@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from util.db import profiles
+
+
+def test_env_references_are_resolved(monkeypatch):
+    monkeypatch.setenv("TEST_DB_PASSWORD", "secret")
+
+    loaded = profiles.load_profiles(json.dumps({
+        "main": {"db_type": "PostgreSQL", "connection_params": {"host": "db", "password_env": "TEST_DB_PASSWORD"}}
+    }))
+
+    assert loaded["main"]["db_type"] == "postgresql"
+    assert loaded["main"]["connection_params"] == {"host": "db", "password": "secret"}
+
+
+def test_missing_env_variable_is_reported_at_load(monkeypatch):
+    monkeypatch.delenv("TEST_MISSING_PASSWORD", raising=False)
+
+    with pytest.raises(ValueError, match="TEST_MISSING_PASSWORD"):
+        profiles.load_profiles(json.dumps({
+            "main": {"db_type": "mysql", "connection_params": {"password_env": "TEST_MISSING_PASSWORD"}}
+        }))
+
+
+def test_default_path_is_used_when_env_is_not_set(monkeypatch, tmp_path):
+    monkeypatch.delenv(profiles.PROFILES_ENV, raising=False)
+    config = tmp_path / "db_profiles.json"
+    config.write_text(json.dumps({"cache": {"db_type": "redis", "warmup": False}}))
+
+    loaded = profiles.load_profiles(default_path=str(config))
+
+    assert list(loaded) == ["cache"]
+    assert profiles.list_profiles()["cache"]["status"]["state"] == "cold"
+
+
+def test_resolve_merges_request_options_over_profile_options():
+    profiles.load_profiles(json.dumps({
+        "main": {"db_type": "mysql", "options": {"max_rows": 5, "timeout": 3}}
+    }))
+
+    db_type, connection_params, options = profiles.resolve("main", {"timeout": 10})
+
+    assert db_type == "mysql"
+    assert options == {"max_rows": 5, "timeout": 10}
+
+
+def test_profile_limits_configure_target():
+    from util.db import admission
+
+    profiles.load_profiles(json.dumps({
+        "limited": {"db_type": "mysql", "connection_params": {"host": "limited-db", "port": 3306},
+                    "options": {"max_concurrency": 2, "max_rows": 5}, "warmup": False}
+    }))
+
+    assert admission._configured["mysql://limited-db:3306"]["max_concurrency"] == 2
+
+
+def test_invalid_profile_limits_are_rejected():
+    with pytest.raises(ValueError, match="max_concurrency"):
+        profiles.load_profiles(json.dumps({
+            "broken": {"db_type": "mysql", "options": {"max_concurrency": 0}}
+        }))
+
+
+def test_warmup_reports_ready_and_failed_counts(capsys):
+    import anyio
+
+    profiles.load_profiles(json.dumps({
+        "ok": {"db_type": "redis", "connection_params": {"host": "localhost"}, "health_check": None},
+        "bad": {"db_type": "redis", "connection_params": {"host": "invalid.host.invalid"}, "health_check": None}
+    }))
+
+    anyio.run(profiles.warmup_all)
+
+    assert "1 ready, 1 failed" in capsys.readouterr().err
+    assert profiles.list_profiles()["bad"]["status"]["state"] == "failed"
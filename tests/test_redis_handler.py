@@ -0,0 +1,185 @@
+import json
+
+import pytest
+
+from util.db import redis_handler
+
+
+class FakeRedis:
+    def __init__(self, keys=(), hash_items=(), value=None):
+        self.keys = keys
+        self.hash_items = hash_items
+        self.value = value
+
+    def get(self, key):
+        return self.value
+
+    def execute_command(self, command, *args):
+        return self.value
+
+    def scan_iter(self, match=None, count=None):
+        return iter(self.keys)
+
+    def hscan_iter(self, name, count=None):
+        return iter(self.hash_items)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(redis_handler, "_connect", lambda connection_params, options: client)
+    return client
+
+
+def _query(command, max_bytes=1048576):
+    return json.loads(redis_handler.handle_redis_query({}, command, None, {"timeout": 1, "max_bytes": max_bytes}))
+
+
+@pytest.mark.parametrize("command", ["GET big", "GETRANGE big 0 -1"])
+def test_scalar_results_respect_byte_budget(fake_client, command):
+    fake_client.value = b"x" * 100000
+
+    result = _query(command, max_bytes=1000)
+
+    assert result["success"]
+    assert result["max_bytes_reached"]
+    assert result["result_bytes"] <= 1000
+    assert len(result["result"]) == 998
+
+
+def test_keys_removes_duplicates_returned_by_scan(fake_client):
+    fake_client.keys = [b"a", b"b", b"a", b"c", b"b"]
+
+    result = _query("KEYS *")
+
+    assert result["keys"] == ["a", "b", "c"]
+    assert result["count"] == 3
+
+
+def test_hgetall_removes_duplicate_fields_returned_by_hscan(fake_client):
+    fake_client.hash_items = [(b"f1", b"1"), (b"f2", b"2"), (b"f1", b"1")]
+
+    result = _query("HGETALL h")
+
+    assert result["result"] == {"f1": "1", "f2": "2"}
+    assert result["count"] == 2
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.replies = []
+
+    def type(self, key):
+        self.replies.append(b"string")
+
+    def memory_usage(self, key):
+        self.replies.append(self.client.sizes.get(key))
+
+    def ttl(self, key):
+        self.replies.append(-1)
+
+    def execute(self, raise_on_error=True):
+        if self.client.pipeline_error is not None and raise_on_error:
+            raise self.client.pipeline_error
+        return self.replies
+
+
+class FakeScanRedis(FakeRedis):
+    def __init__(self, sizes, pipeline_error=None):
+        super().__init__()
+        self.sizes = sizes
+        self.pipeline_error = pipeline_error
+
+    def scan(self, cursor=0, match=None, count=10):
+        keys = list(self.sizes)
+        next_cursor = cursor + count if cursor + count < len(keys) else 0
+        return next_cursor, keys[cursor:cursor + count]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def _analyze(client, monkeypatch, **options):
+    monkeypatch.setattr(redis_handler, "_connect", lambda connection_params, opts: client)
+    options = {
+        "match": "*", "patterns": [], "separator": ":", "depth": 1, "top_n": 20, "max_groups": 1000, "sample_rate": 1.0,
+        "time_budget": 10, "batch_size": 100, "cursor": 0, "timeout": 1, **options
+    }
+    return json.loads(redis_handler.handle_redis_analyze({}, options))
+
+
+def test_analyze_groups_keys_by_prefix(monkeypatch):
+    sizes = {f"user:{i}".encode(): 100 for i in range(10)}
+    sizes.update({f"session:{i}".encode(): 50 for i in range(5)})
+
+    result = _analyze(FakeScanRedis(sizes), monkeypatch)
+
+    assert result["success"]
+    assert result["complete"]
+    assert [(g["pattern"], g["count"], g["bytes"]) for g in result["top_by_bytes"]] == [
+        ("user:*", 10, 1000), ("session:*", 5, 250)
+    ]
+
+
+def test_analyze_fails_when_memory_usage_is_denied(monkeypatch):
+    redis = pytest.importorskip("redis")
+    client = FakeScanRedis({b"a:1": 10}, pipeline_error=redis.ResponseError("NOPERM this user has no permissions to run the 'memory' command"))
+
+    result = _analyze(client, monkeypatch)
+
+    assert not result["success"]
+    assert "NOPERM" in result["error"]
+    assert not result["connection_error"]
+
+
+def test_analyze_keeps_flat_keyspace_in_one_group(monkeypatch):
+    sizes = {f"{i:032x}".encode(): 10 for i in range(500)}
+
+    result = _analyze(FakeScanRedis(sizes), monkeypatch)
+
+    assert result["group_count"] == 1
+    assert result["top_by_count"][0]["pattern"] == "<no-prefix>"
+    assert result["top_by_count"][0]["count"] == 500
+
+
+def test_analyze_groups_short_keys_by_prefix_when_depth_exceeds_segments(monkeypatch):
+    sizes = {f"user:{i}".encode(): 10 for i in range(50)}
+
+    result = _analyze(FakeScanRedis(sizes), monkeypatch, depth=2)
+
+    assert result["group_count"] == 1
+    assert result["top_by_count"][0]["pattern"] == "user:*"
+
+
+def test_analyze_caps_number_of_groups(monkeypatch):
+    sizes = {f"tenant{i}:item:1".encode(): 10 for i in range(50)}
+
+    result = _analyze(FakeScanRedis(sizes), monkeypatch, max_groups=10)
+
+    assert result["group_count"] == 11
+    assert result["overflow_keys"] == 40
+    assert {"pattern": "<other>", "count": 40}.items() <= next(
+        g for g in result["top_by_count"] if g["pattern"] == "<other>"
+    ).items()
+
+
+def test_authentication_error_is_not_connection_error(monkeypatch):
+    redis = pytest.importorskip("redis")
+
+    def connect(connection_params, options):
+        raise redis.AuthenticationError("invalid username-password pair")
+
+    monkeypatch.setattr(redis_handler, "_connect", connect)
+
+    assert not _query("GET a")["connection_error"]
+
+    def refuse(connection_params, options):
+        raise redis.ConnectionError("Error 111 connecting to localhost:6379. Connection refused.")
+
+    monkeypatch.setattr(redis_handler, "_connect", refuse)
+
+    assert _query("GET a")["connection_error"]
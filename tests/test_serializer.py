@@ -0,0 +1,68 @@
+import json
+
+from util.db.serializer import ResultWriter, serialize_rows
+
+
+def test_truncates_multibyte_bytes_without_breaking_characters():
+    writer = ResultWriter({"max_field_length": 2})
+
+    value = writer.truncate("안녕하세요".encode("utf-8"))
+
+    assert value == "안녕"
+    assert writer.truncated_fields == 1
+    # 잘려 나간 "하세요"의 UTF-8 바이트 수
+    assert writer.truncated_field_bytes == len("하세요".encode("utf-8"))
+
+
+def test_truncated_field_bytes_counts_utf8_bytes_for_text():
+    writer = ResultWriter({"max_field_length": 3})
+
+    assert writer.truncate({"name": "가나다라마"}) == {"name": "가나다"}
+    assert writer.truncated_field_bytes == 6
+
+
+def test_byte_budget_stops_serialization():
+    rows = ({"id": i, "body": "x" * 100} for i in range(1000))
+
+    result = json.loads(serialize_rows(rows, {"max_bytes": 1000}, max_rows=1000))
+
+    assert result["max_bytes_reached"]
+    assert 0 < result["count"] < 1000
+    assert len(json.dumps(result["results"])) == result["result_bytes"]
+
+
+def test_reports_first_row_that_exceeds_budget():
+    rows = [{"id": 1, "title": "a", "body": "x" * 5000}]
+
+    result = json.loads(serialize_rows(rows, {"max_bytes": 1000}, max_rows=1000))
+
+    assert result["count"] == 0
+    assert result["max_bytes_reached"]
+    assert result["skipped_item"]["largest_field"] == "body"
+    assert result["skipped_item"]["bytes"] > 5000
+
+
+def test_no_skipped_item_when_everything_fits():
+    result = json.loads(serialize_rows([{"id": 1}], {"max_bytes": 1000}))
+
+    assert "skipped_item" not in result
+
+
+def test_large_scalar_value_is_cut_to_byte_budget():
+    value = ("가" * 100000).encode("utf-8")
+
+    result = json.loads(ResultWriter({"max_bytes": 1000}).value_response({"success": True}, "result", value))
+
+    assert result["max_bytes_reached"]
+    assert result["result_bytes"] <= 1000
+    assert len(json.dumps(result["result"])) == result["result_bytes"]
+    assert set(result["result"]) == {"가"}
+    assert result["truncated_field_bytes"] == len(value) - len(result["result"].encode("utf-8"))
+
+
+def test_small_scalar_value_is_returned_whole():
+    result = json.loads(ResultWriter({"max_bytes": 1000}).value_response({"success": True}, "result", b"hello"))
+
+    assert result["result"] == "hello"
+    assert not result["max_bytes_reached"]
+    assert result["result_bytes"] == len('"hello"')
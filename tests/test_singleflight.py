@@ -0,0 +1,142 @@
+import anyio
+import pytest
+
+from util.db import singleflight
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT * FROM users WHERE id = %s",
+    "select name from users",
+    "SELECT 1",
+    "SELECT 1 FROM DUAL",
+    "SELECT COUNT(*) FROM orders",
+    "SELECT * FROM information_schema.tables",
+])
+def test_plain_select_is_read(query):
+    assert singleflight.is_read_query("postgresql", query, None)
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT nextval('order_seq')",
+    "SELECT nextval('order_seq') FROM orders LIMIT 1",
+    "SELECT order_seq.NEXTVAL FROM DUAL",
+    "SELECT * FROM accounts WHERE id = 1 FOR UPDATE",
+    "SELECT * FROM accounts FOR SHARE",
+    "SELECT * FROM accounts LOCK IN SHARE MODE",
+    "SELECT * INTO new_table FROM accounts",
+    "SELECT id INTO @last_id FROM accounts LIMIT 1",
+    "SELECT GET_LOCK('job', 10)",
+    "SELECT pg_advisory_lock(42)",
+    "SELECT RAND() FROM users",
+    "SELECT my_side_effect_function()",
+    "SELECT my_func(1) FROM DUAL",
+    "UPDATE users SET name = 'a'",
+])
+def test_side_effecting_sql_is_not_read(query):
+    assert not singleflight.is_read_query("mysql", query, None)
+
+
+def test_mongodb_only_collection_find_is_read():
+    assert singleflight.is_read_query("mongodb", '{"find": {}}', {"collection": "users"})
+    assert not singleflight.is_read_query("mongodb", '{"find": {}}', None)
+    assert not singleflight.is_read_query("mongodb", '{"delete": {}}', {"collection": "users"})
+
+
+def test_redis_read_commands():
+    assert singleflight.is_read_query("redis", "GET user:1", None)
+    assert not singleflight.is_read_query("redis", "INCR counter", None)
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    executions = []
+    results = []
+
+    async def query():
+        executions.append(1)
+        await anyio.sleep(0.05)
+        return '{"success": true}'
+
+    async def call():
+        results.append(await singleflight.do("shared", query, timeout=5))
+
+    async def main():
+        async with anyio.create_task_group() as tg:
+            for _ in range(5):
+                tg.start_soon(call)
+
+    before = singleflight.get_stats()
+    anyio.run(main)
+    after = singleflight.get_stats()
+
+    assert len(executions) == 1
+    assert results == ['{"success": true}'] * 5
+    assert after["coalesced"] - before["coalesced"] == 4
+    assert after["in_flight"] == 0
+
+
+def test_follower_wait_is_bounded():
+    errors = []
+
+    async def slow_query():
+        await anyio.sleep(0.5)
+        return "{}"
+
+    async def follower():
+        await anyio.sleep(0.01)
+        try:
+            await singleflight.do("slow", slow_query, timeout=0.05)
+        except TimeoutError as e:
+            errors.append(e)
+
+    async def main():
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(singleflight.do, "slow", slow_query, 5)
+            tg.start_soon(follower)
+
+    anyio.run(main)
+
+    assert len(errors) == 1
+
+
+def test_leader_error_is_shared():
+    errors = []
+
+    async def failing_query():
+        await anyio.sleep(0.02)
+        raise ValueError("boom")
+
+    async def call():
+        try:
+            await singleflight.do("failing", failing_query, timeout=5)
+        except ValueError as e:
+            errors.append(e)
+
+    async def main():
+        async with anyio.create_task_group() as tg:
+            for _ in range(3):
+                tg.start_soon(call)
+
+    anyio.run(main)
+
+    assert len(errors) == 3
+
+
+def test_follower_waits_for_slow_leader_without_timeout():
+    results = []
+
+    async def slow_query():
+        await anyio.sleep(0.2)
+        return '{"success": true}'
+
+    async def call():
+        results.append(await singleflight.do("slow-shared", slow_query))
+
+    async def main():
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(call)
+            await anyio.sleep(0.01)
+            tg.start_soon(call)
+
+    anyio.run(main)
+
+    assert results == ['{"success": true}'] * 2
@@ -1,2 +1,2 @@
 # 필요한 모듈을 패키지 외부에서 사용할 수 있도록 노출
-from .core import execute_database_query
+from .core import execute_database_query, analyze_redis_keyspace, get_query_stats
@@ -0,0 +1,321 @@
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import anyio
+
+# 대상별 제한 기본값 (서버 설정인 configure()로만 바꿀 수 있으며, 요청 옵션으로는 바꿀 수 없음)
+DEFAULT_LIMITS = {
+    "max_concurrency": 10,        # 대상별 동시 실행 수
+    "queue_timeout": 10,          # 실행 슬롯/토큰을 기다리는 최대 시간(초)
+    "rate_limit": None,           # 대상별 초당 허용 요청 수 (None이면 제한 없음)
+    "rate_burst": None,           # 순간 허용 요청 수 (None이면 rate_limit과 동일)
+    "breaker_threshold": 5,       # 회로를 여는 연속 연결 오류 수
+    "breaker_reset_timeout": 30   # 회로가 열린 뒤 재시도(half-open)까지의 시간(초)
+}
+
+
+class AdmissionError(Exception):
+    """대기 시간 안에 실행 슬롯을 얻지 못한 경우"""
+
+
+class CircuitOpenError(AdmissionError):
+    """연속된 연결 오류로 회로가 열려 요청을 즉시 거부한 경우"""
+
+
+class _TokenBucket:
+    """초당 rate개의 토큰이 채워지는 토큰 버킷"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    async def take(self, deadline: float) -> bool:
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+
+            wait = (1 - self.tokens) / self.rate
+
+            # 대기 시간 안에 토큰이 채워지지 않으면 바로 거부
+            if now + wait > deadline:
+                return False
+            await anyio.sleep(wait)
+
+
+class _CircuitBreaker:
+    """
+    연속 연결 오류가 임계값을 넘으면 열리고, 일정 시간 후 한 건의 요청으로 복구를 확인
+
+    회로가 열리거나 닫힐 때마다 세대(generation)가 바뀌며, 요청은 허용될 때의 세대를 가지고
+    결과를 기록합니다. 회로가 열리기 전에 시작되어 늦게 끝난 요청이 회로를 닫지 않도록
+    현재 세대의 요청과 half-open 확인 요청의 결과만 반영합니다.
+    """
+
+    def __init__(self, threshold: int, reset_timeout: float):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.generation = 0
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def allow(self) -> Optional[Tuple[int, bool]]:
+        """
+        요청을 허용하면 (세대, 확인 요청 여부)를, 거부하면 None을 반환
+        """
+        if self.state == "closed":
+            return self.generation, False
+
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return None
+            self.state = "half_open"
+
+        # half-open 상태에서는 한 번에 하나의 확인 요청만 허용
+        if self.probing:
+            return None
+        self.probing = True
+        return self.generation, True
+
+    def cancel(self, permit: Tuple[int, bool]):
+        """허용받은 요청이 실행되지 못한 경우 확인 요청 자리를 반환"""
+        if permit[1]:
+            self.probing = False
+
+    def _open(self):
+        self.state = "open"
+        self.generation += 1
+        self.opened_at = time.monotonic()
+        self.probing = False
+
+    def record_success(self, permit: Tuple[int, bool]):
+        generation, probe = permit
+
+        if probe:
+            # 확인 요청이 성공하면 회로를 닫고 새 세대를 시작
+            self.state = "closed"
+            self.generation += 1
+            self.failures = 0
+            self.probing = False
+        elif self.state == "closed" and generation == self.generation:
+            self.failures = 0
+
+    def record_failure(self, permit: Tuple[int, bool]):
+        generation, probe = permit
+
+        if probe:
+            self._open()
+        elif self.state == "closed" and generation == self.generation:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self._open()
+
+
+class _Target:
+    """대상별 동시 실행 제한, 요청 속도 제한, 회로 차단기 상태"""
+
+    def __init__(self, options: Dict[str, Any]):
+        self.semaphore = anyio.Semaphore(options["max_concurrency"])
+        self.bucket = None
+        if options["rate_limit"]:
+            burst = options["rate_burst"] or max(1, options["rate_limit"])
+            self.bucket = _TokenBucket(options["rate_limit"], burst)
+        self.breaker = _CircuitBreaker(options["breaker_threshold"], options["breaker_reset_timeout"])
+        self.queue_timeout = options["queue_timeout"]
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+
+
+class _Ticket:
+    """실행 결과를 회로 차단기에 전달하기 위한 핸들"""
+
+    def __init__(self):
+        self.failed = False
+
+    def fail(self):
+        """연결 오류로 실패했음을 기록"""
+        self.failed = True
+
+
+# 대기는 모두 서버의 이벤트 루프에서 이루어지므로 별도의 잠금이 필요 없음
+_targets: Dict[str, _Target] = {}
+# 서버 설정(프로필)으로 지정한 대상별 제한
+_configured: Dict[str, Dict[str, Any]] = {}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate_limits(limits: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    제한 설정을 검증하고 기본값과 병합한 결과를 반환합니다.
+
+    Raises:
+        ValueError: 알 수 없는 항목이 있거나 값이 허용 범위를 벗어난 경우
+    """
+    unknown = set(limits) - set(DEFAULT_LIMITS)
+    if unknown:
+        raise ValueError(f"Unknown limit options: {', '.join(sorted(unknown))}")
+
+    merged = dict(DEFAULT_LIMITS)
+    merged.update(limits)
+
+    for key in ("max_concurrency", "breaker_threshold"):
+        if not isinstance(merged[key], int) or isinstance(merged[key], bool) or merged[key] < 1:
+            raise ValueError(f"{key} must be an integer >= 1")
+
+    for key in ("queue_timeout", "breaker_reset_timeout"):
+        if not _is_number(merged[key]) or merged[key] <= 0:
+            raise ValueError(f"{key} must be a positive number")
+
+    for key in ("rate_limit", "rate_burst"):
+        if merged[key] is not None and (not _is_number(merged[key]) or merged[key] <= 0):
+            raise ValueError(f"{key} must be a positive number or null")
+
+    return merged
+
+
+def configure(limits_by_key: Dict[str, Dict[str, Any]]):
+    """
+    대상별 제한을 설정합니다. 이전 설정은 모두 대체되며, 설정이 바뀐 대상은
+    다음 요청부터 새 설정으로 다시 만들어집니다.
+
+    Args:
+        limits_by_key: 대상 식별자(target_key 참고)별 제한 설정 (DEFAULT_LIMITS 참고)
+
+    Raises:
+        ValueError: 제한 설정이 올바르지 않은 경우
+    """
+    validated = {key: validate_limits(limits) for key, limits in limits_by_key.items()}
+
+    for key in set(_configured) | set(validated):
+        if _configured.get(key) != validated.get(key):
+            _targets.pop(key, None)
+
+    _configured.clear()
+    _configured.update(validated)
+
+
+def target_key(db_type: str, connection_params: Dict[str, Any]) -> str:
+    """
+    제한을 적용할 대상 서버의 식별자를 생성합니다.
+    인증 정보는 포함하지 않습니다.
+
+    Args:
+        db_type: 데이터베이스 유형
+        connection_params: 데이터베이스 연결 정보
+
+    Returns:
+        '<db_type>://<host>:<port>' 형식의 문자열
+    """
+    if "connection_string" in connection_params:
+        location = urlsplit(connection_params["connection_string"]).netloc.rsplit("@", 1)[-1]
+    else:
+        location = "{}:{}".format(connection_params.get("host", "localhost"), connection_params.get("port", ""))
+
+    return f"{db_type.lower()}://{location}"
+
+
+def _get_target(key: str) -> _Target:
+    target = _targets.get(key)
+    if target is None:
+        target = _Target(_configured.get(key, DEFAULT_LIMITS))
+        _targets[key] = target
+    return target
+
+
+def _reject(target: _Target, error: AdmissionError):
+    target.rejected += 1
+    raise error
+
+
+@asynccontextmanager
+async def admit(key: str, queue_timeout: Optional[float] = None) -> AsyncIterator[_Ticket]:
+    """
+    대상별 제한을 통과한 경우에만 블록을 실행합니다.
+    토큰과 실행 슬롯은 이벤트 루프에서 기다리므로 대기 중인 요청은 워커 스레드를 점유하지 않습니다.
+
+    Args:
+        key: 대상 식별자 (target_key 참고)
+        queue_timeout: 요청별 최대 대기 시간(초), 대상에 설정된 값보다 짧게만 지정 가능
+
+    Raises:
+        ValueError: queue_timeout이 음수이거나 숫자가 아닌 경우
+        CircuitOpenError: 회로가 열려 있는 경우
+        AdmissionError: queue_timeout 안에 토큰이나 실행 슬롯을 얻지 못한 경우
+    """
+    target = _get_target(key)
+
+    if queue_timeout is None:
+        queue_timeout = target.queue_timeout
+    elif not _is_number(queue_timeout) or queue_timeout < 0:
+        raise ValueError("queue_timeout must be a non-negative number")
+    else:
+        queue_timeout = min(queue_timeout, target.queue_timeout)
+
+    # 회로가 열려 있으면 연결을 시도하지 않고 즉시 실패
+    permit = target.breaker.allow()
+    if permit is None:
+        _reject(target, CircuitOpenError(f"Circuit open for {key} after repeated connection errors"))
+
+    deadline = time.monotonic() + queue_timeout
+    rate_limited = False
+    acquired = False
+
+    # 토큰이나 실행 슬롯을 기다리다 거부되거나 취소되면 확인 요청 자리를 반드시 반환
+    target.waiting += 1
+    try:
+        if target.bucket is not None and not await target.bucket.take(deadline):
+            rate_limited = True
+        else:
+            with anyio.move_on_after(max(0, deadline - time.monotonic())):
+                await target.semaphore.acquire()
+                acquired = True
+    finally:
+        target.waiting -= 1
+        if not acquired:
+            target.breaker.cancel(permit)
+
+    if rate_limited:
+        _reject(target, AdmissionError(f"Rate limit exceeded for {key}"))
+    if not acquired:
+        _reject(target, AdmissionError(f"Too many concurrent requests for {key}"))
+
+    target.active += 1
+    ticket = _Ticket()
+    try:
+        yield ticket
+    finally:
+        if ticket.failed:
+            target.breaker.record_failure(permit)
+        else:
+            target.breaker.record_success(permit)
+
+        target.active -= 1
+        target.semaphore.release()
+
+
+def get_stats() -> Dict[str, Dict[str, Any]]:
+    """대상별 제한 상태를 반환"""
+    return {
+        key: {
+            "circuit": target.breaker.state,
+            "consecutive_failures": target.breaker.failures,
+            "active": target.active,
+            "waiting": target.waiting,
+            "rejected": target.rejected
+        }
+        for key, target in _targets.items()
+    }
@@ -1,14 +1,19 @@
 import json
-from typing import Dict, List, Any, Optional, Union
+from functools import partial
+from typing import Callable, Dict, List, Any, Optional, Union
+
+import anyio
 
 from .validators import is_safe_query
+from . import admission
+from . import singleflight
 from .mysql_handler import handle_mysql_query
 from .postgresql_handler import handle_postgresql_query
 from .oracle_handler import handle_oracle_query
 from .mongodb_handler import handle_mongodb_query
-from .redis_handler import handle_redis_query
+from .redis_handler import handle_redis_query, handle_redis_analyze
 
-def execute_database_query(
+async def execute_database_query(
     db_type: str,
     connection_params: Dict[str, Any],
     query: str,
@@ -27,12 +32,19 @@ def execute_database_query(
         
     Returns:
         쿼리 실행 결과 (JSON 문자열)
+
+    블로킹 드라이버 호출은 워커 스레드에서 실행하며, 동일한 읽기 쿼리를 기다리는 호출은
+    스레드를 점유하지 않고 이벤트 루프에서 대기합니다.
     """
     # 기본 옵션 설정
     default_options = {
         "max_rows": 1000,  # 최대 반환 행 수
+        "max_bytes": 1048576,  # 최대 반환 결과 크기(바이트), 도달하면 더 이상 가져오지 않음
+        "max_field_length": None,  # 문자열/바이너리 필드의 최대 길이(문자 수) (None이면 자르지 않음)
         "timeout": 30,     # 쿼리 타임아웃(초)
-        "safe_mode": True  # 안전 모드 (위험한 쿼리 방지)
+        "safe_mode": True,  # 안전 모드 (위험한 쿼리 방지)
+        "singleflight": True,  # 동시에 들어온 동일한 읽기 쿼리를 한 번만 실행
+        "queue_timeout": None  # 실행 슬롯을 기다리는 최대 시간(초) (None이면 대상에 설정된 값)
     }
     
     if options is None:
@@ -51,6 +63,122 @@ def execute_database_query(
                 "error": "Potentially unsafe query detected. Disable safe_mode if you want to run this query."
             })
             
+    run = partial(
+        _admit_query,
+        db_type, connection_params, options,
+        lambda: _dispatch_query(db_type, connection_params, query, params, options)
+    )
+
+    # 진행 중인 동일한 읽기 쿼리가 있으면 그 결과를 공유
+    if options["singleflight"] and singleflight.is_read_query(db_type, query, params):
+        key = singleflight.make_key(db_type, connection_params, query, params, options)
+        # 선행 호출은 대상별 제한과 드라이버 타임아웃으로 이미 제한되므로 별도의 대기 제한 없이 결과를 기다림
+        # (timeout은 연결/소켓 타임아웃일 뿐 쿼리 실행 시간을 제한하지 않으므로 이를 기준으로 끊으면
+        # 혼자 실행했다면 성공했을 호출이 실패함)
+        return await singleflight.do(key, run)
+
+    return await run()
+
+async def analyze_redis_keyspace(
+    connection_params: Dict[str, Any],
+    options: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Redis 키스페이스를 SCAN으로 훑으며 키 패턴별 메모리 사용량을 분석합니다.
+
+    Args:
+        connection_params: Redis 연결 정보
+        options: 분석 옵션 (선택 사항)
+
+    Returns:
+        분석 결과 (JSON 문자열)
+    """
+    # 기본 옵션 설정
+    default_options = {
+        "match": "*",          # SCAN 대상 키 패턴
+        "patterns": [],        # 그룹으로 묶을 glob 패턴 목록 (먼저 일치하는 패턴 사용)
+        "separator": ":",      # 패턴에 일치하지 않는 키를 접두사로 묶을 때의 구분자
+        "depth": 1,            # 접두사로 사용할 구분자 단위 개수
+        "top_n": 20,           # 반환할 상위 그룹 수
+        "max_groups": 1000,    # 최대 그룹 수 (넘는 키는 "<other>" 그룹으로 집계)
+        "sample_rate": 1.0,    # 분석할 키의 비율 (0~1)
+        "time_budget": 10,     # 최대 분석 시간(초)
+        "batch_size": 500,     # SCAN COUNT 및 파이프라인 배치 크기
+        "cursor": 0,           # 이어서 분석할 SCAN 커서
+        "timeout": 30,         # 명령 타임아웃(초)
+        "queue_timeout": None  # 실행 슬롯을 기다리는 최대 시간(초) (None이면 대상에 설정된 값)
+    }
+
+    if options is None:
+        options = {}
+
+    # 기본 옵션과 사용자 옵션 병합
+    for key, value in default_options.items():
+        if key not in options:
+            options[key] = value
+
+    try:
+        return await _admit_query(
+            "redis", connection_params, options,
+            lambda: handle_redis_analyze(connection_params, options)
+        )
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        })
+
+def get_query_stats() -> Dict[str, Any]:
+    """
+    쿼리 실행 통계를 반환합니다.
+
+    Returns:
+        singleflight 중복 제거 통계와 대상별 제한 상태를 담은 딕셔너리
+    """
+    return {
+        "singleflight": singleflight.get_stats(),
+        "targets": admission.get_stats()
+    }
+
+def _is_connection_failure(result: str) -> bool:
+    """핸들러 응답이 연결 오류로 인한 실패인지 확인"""
+    # 오류 응답만 파싱하여 큰 결과를 다시 읽지 않도록 함
+    if not result.startswith('{"success": false'):
+        return False
+    return bool(json.loads(result).get("connection_error", False))
+
+async def _admit_query(
+    db_type: str,
+    connection_params: Dict[str, Any],
+    options: Dict[str, Any],
+    run: Callable[[], str]
+) -> str:
+    """대상별 제한을 통과한 경우에만 run을 워커 스레드에서 실행"""
+    key = admission.target_key(db_type, connection_params)
+
+    try:
+        # 제한 설정은 서버 설정을 따르며, 요청 옵션으로는 대기 시간만 줄일 수 있음
+        async with admission.admit(key, options["queue_timeout"]) as ticket:
+            result = await anyio.to_thread.run_sync(run)
+            if _is_connection_failure(result):
+                ticket.fail()
+            return result
+    except admission.AdmissionError as e:
+        return json.dumps({
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        })
+
+def _dispatch_query(
+    db_type: str,
+    connection_params: Dict[str, Any],
+    query: str,
+    params: Optional[Union[List, Dict]],
+    options: Dict[str, Any]
+) -> str:
+    """데이터베이스 유형에 맞는 핸들러로 쿼리를 전달"""
     try:
         # 데이터베이스 유형에 따라 적절한 핸들러 호출
         if db_type.lower() == "mysql":
@@ -1,10 +1,13 @@
 import json
 from typing import Dict, List, Any, Optional, Union
 
+from .serializer import ResultWriter, serialize_rows
+
 def handle_mongodb_query(connection_params: Dict[str, Any], query: str, params: Optional[Dict], options: Dict[str, Any]) -> str:
     """MongoDB 쿼리 실행 및 결과 반환"""
     
     from pymongo import MongoClient
+    from pymongo.errors import ConnectionFailure
     import bson.json_util
     
     client = None
@@ -61,15 +64,13 @@ def handle_mongodb_query(connection_params: Dict[str, Any], query: str, params:
                     
                 cursor = cursor.limit(limit)
                 
-                results = list(cursor)
+                # BSON 문서를 하나씩 JSON으로 변환하며 바이트 예산에 도달하면 중단
+                documents = (json.loads(bson.json_util.dumps(document)) for document in cursor)
                 
-                # BSON 객체를 JSON으로 변환
-                return json.dumps({
-                    "success": True,
-                    "count": len(results),
-                    "max_rows_reached": len(results) >= options["max_rows"],
-                    "results": json.loads(bson.json_util.dumps(results))
-                })
+                try:
+                    return serialize_rows(documents, options, max_rows=options["max_rows"])
+                finally:
+                    cursor.close()
                 
             elif "insert" in command:
                 # 삽입 쿼리
@@ -126,15 +127,28 @@ def handle_mongodb_query(connection_params: Dict[str, Any], query: str, params:
             # 데이터베이스 직접 명령 실행
             result = db.command(command)
             
-            return json.dumps({
-                "success": True,
-                "result": json.loads(bson.json_util.dumps(result))
-            })
+            # aggregate 등 커서를 반환하는 명령은 첫 배치의 문서를 바이트 예산 안에서 직렬화
+            cursor_info = result.get("cursor")
+            if isinstance(cursor_info, dict) and isinstance(cursor_info.get("firstBatch"), list):
+                documents = (
+                    json.loads(bson.json_util.dumps(document))
+                    for document in cursor_info["firstBatch"][:options["max_rows"]]
+                )
+                return serialize_rows(documents, options, max_rows=options["max_rows"])
+                
+            # 그 외 명령 결과는 최상위 항목 단위로 바이트 예산 적용
+            writer = ResultWriter(options)
+            for key, value in json.loads(bson.json_util.dumps(result)).items():
+                if not writer.add_item(key, value):
+                    break
+                    
+            return writer.response({"success": True}, "result", as_object=True)
             
     except Exception as e:
         return json.dumps({
             "success": False,
-            "error": str(e)
+            "error": str(e),
+            "connection_error": isinstance(e, ConnectionFailure)  # 서버 선택/네트워크 오류
         })
         
     finally:
@@ -1,6 +1,12 @@
 import json
 from typing import Dict, List, Any, Optional, Union
 
+from .serializer import iter_cursor, serialize_rows
+
+# 네트워크 수준의 연결 오류 코드 (인증 실패, 없는 데이터베이스 등은 제외)
+# 2003: 서버에 연결할 수 없음, 2005: 알 수 없는 호스트, 2006: 서버 연결 끊김, 2013: 쿼리 중 연결 끊김
+NETWORK_ERRNOS = {2003, 2005, 2006, 2013}
+
 def handle_mysql_query(connection_params: Dict[str, Any], query: str, params: Optional[Union[List, Dict]], options: Dict[str, Any]) -> str:
     """MySQL 쿼리 실행 및 결과 반환"""
     
@@ -38,14 +44,10 @@ def handle_mysql_query(connection_params: Dict[str, Any], query: str, params: Op
             
         # SELECT 쿼리인 경우 결과 반환
         if query.strip().upper().startswith("SELECT"):
-            results = cursor.fetchmany(options["max_rows"])
+            # 바이트 예산에 도달할 때까지 배치 단위로 가져오며 직렬화
+            rows = iter_cursor(cursor, options["max_rows"])
             
-            return json.dumps({
-                "success": True, 
-                "count": len(results),
-                "max_rows_reached": len(results) >= options["max_rows"],
-                "results": results
-            })
+            return serialize_rows(rows, options, max_rows=options["max_rows"])
         else:
             # 데이터 변경 쿼리인 경우 커밋 및 영향 받은 행 수 반환
             conn.commit()
@@ -56,16 +58,22 @@ def handle_mysql_query(connection_params: Dict[str, Any], query: str, params: Op
             })
             
     except Error as e:
-        if conn:
-            conn.rollback()  # 오류 발생 시 롤백
+        if conn and not conn.unread_result:
+            conn.rollback()  # 오류 발생 시 롤백 (읽지 않은 결과가 남아 있으면 연결 종료 시 롤백됨)
             
         return json.dumps({
             "success": False,
-            "error": str(e)
+            "error": str(e),
+            "connection_error": getattr(e, "errno", None) in NETWORK_ERRNOS
         })
         
     finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+        if conn and conn.unread_result:
+            # 바이트 예산/max_rows로 중간에 읽기를 멈춘 경우 cursor.close()가 남은 행을 서버에서
+            # 모두 읽어 버리지 않도록 커서를 닫지 않고 연결을 끊음
+            conn.disconnect()
+        else:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
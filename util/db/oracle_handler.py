@@ -1,6 +1,18 @@
 import json
 from typing import Dict, List, Any, Optional, Union
 
+from .serializer import iter_cursor, serialize_rows
+
+# 네트워크 수준의 연결 오류 코드 (인증 실패, 잘못된 서비스 이름 등은 제외)
+# ORA-12170: 연결 타임아웃, ORA-12541: 리스너 없음, ORA-12543/12545: 대상 호스트에 도달할 수 없음,
+# ORA-12537/12547/03113/03135: 연결 끊김
+NETWORK_ERROR_CODES = {12170, 12541, 12543, 12545, 12537, 12547, 3113, 3135}
+
+def _is_network_error(e: Exception) -> bool:
+    """cx_Oracle 오류가 네트워크 수준의 연결 오류인지 확인"""
+    error = e.args[0] if e.args else None
+    return getattr(error, "code", None) in NETWORK_ERROR_CODES
+
 def handle_oracle_query(connection_params: Dict[str, Any], query: str, params: Optional[Union[List, Dict]], options: Dict[str, Any]) -> str:
     """Oracle 쿼리 실행 및 결과 반환"""
     
@@ -34,17 +46,10 @@ def handle_oracle_query(connection_params: Dict[str, Any], query: str, params: O
             # 컬럼 이름 가져오기
             columns = [col[0].lower() for col in cursor.description]
             
-            # 결과를 딕셔너리 리스트로 변환
-            results = []
-            for row in cursor.fetchmany(options["max_rows"]):
-                results.append(dict(zip(columns, row)))
+            # 결과를 딕셔너리로 변환하며 바이트 예산에 도달할 때까지 배치 단위로 직렬화
+            rows = (dict(zip(columns, row)) for row in iter_cursor(cursor, options["max_rows"]))
             
-            return json.dumps({
-                "success": True, 
-                "count": len(results),
-                "max_rows_reached": len(results) >= options["max_rows"],
-                "results": results
-            })
+            return serialize_rows(rows, options, max_rows=options["max_rows"])
         else:
             # 데이터 변경 쿼리인 경우 커밋 및 영향 받은 행 수 반환
             conn.commit()
@@ -60,7 +65,8 @@ def handle_oracle_query(connection_params: Dict[str, Any], query: str, params: O
             
         return json.dumps({
             "success": False,
-            "error": str(e)
+            "error": str(e),
+            "connection_error": _is_network_error(e)
         })
         
     finally:
@@ -1,6 +1,29 @@
 import json
 from typing import Dict, List, Any, Optional, Union
 
+from .serializer import FETCH_BATCH_SIZE, iter_cursor, serialize_rows
+
+# 네트워크 수준의 연결 오류 메시지 (libpq는 연결 단계 오류에 SQLSTATE를 주지 않으므로 메시지로 구분)
+NETWORK_ERROR_MESSAGES = (
+    "could not connect to server",
+    "could not translate host name",
+    "connection refused",
+    "connection timed out",
+    "timeout expired",
+    "no route to host",
+    "network is unreachable",
+    "server closed the connection unexpectedly",
+)
+
+def _is_network_error(e: Exception) -> bool:
+    """psycopg2 오류가 네트워크 수준의 연결 오류인지 확인 (인증 실패, 없는 데이터베이스 등은 제외)"""
+    import psycopg2
+
+    if not isinstance(e, psycopg2.OperationalError) or getattr(e, "pgcode", None):
+        return False
+    message = str(e).lower()
+    return any(marker in message for marker in NETWORK_ERROR_MESSAGES)
+
 def handle_postgresql_query(connection_params: Dict[str, Any], query: str, params: Optional[Union[List, Dict]], options: Dict[str, Any]) -> str:
     """PostgreSQL 쿼리 실행 및 결과 반환"""
     
@@ -29,7 +52,16 @@ def handle_postgresql_query(connection_params: Dict[str, Any], query: str, param
         
         # 데이터베이스 연결
         conn = psycopg2.connect(**connect_params)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)  # 결과를 딕셔너리로 반환
+        
+        is_select = query.strip().upper().startswith("SELECT")
+        
+        if is_select:
+            # 서버 측(named) 커서를 사용하여 결과 전체를 클라이언트 메모리에 올리지 않고
+            # fetchmany 할 때마다 필요한 만큼만 가져옴
+            cursor = conn.cursor(name="mcp_query", cursor_factory=RealDictCursor)
+            cursor.itersize = FETCH_BATCH_SIZE
+        else:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)  # 결과를 딕셔너리로 반환
         
         # 쿼리 실행
         if params:
@@ -38,18 +70,12 @@ def handle_postgresql_query(connection_params: Dict[str, Any], query: str, param
             cursor.execute(query)
             
         # SELECT 쿼리인 경우 결과 반환
-        if query.strip().upper().startswith("SELECT"):
-            results = cursor.fetchmany(options["max_rows"])
-            
+        if is_select:
+            # 바이트 예산에 도달할 때까지 배치 단위로 가져오며 직렬화
             # RealDictRow 객체를 일반 딕셔너리로 변환
-            dict_results = [dict(row) for row in results]
+            rows = (dict(row) for row in iter_cursor(cursor, options["max_rows"]))
             
-            return json.dumps({
-                "success": True, 
-                "count": len(dict_results),
-                "max_rows_reached": len(dict_results) >= options["max_rows"],
-                "results": dict_results
-            })
+            return serialize_rows(rows, options, max_rows=options["max_rows"])
         else:
             # 데이터 변경 쿼리인 경우 커밋 및 영향 받은 행 수 반환
             conn.commit()
@@ -60,12 +86,15 @@ def handle_postgresql_query(connection_params: Dict[str, Any], query: str, param
             })
             
     except Error as e:
+        if cursor:
+            cursor.close()  # 서버 측 커서는 롤백 전에 닫아야 함
         if conn:
             conn.rollback()  # 오류 발생 시 롤백
             
         return json.dumps({
             "success": False,
-            "error": str(e)
+            "error": str(e),
+            "connection_error": _is_network_error(e)
         })
         
     finally:
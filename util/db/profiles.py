@@ -0,0 +1,249 @@
+import importlib
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import anyio
+
+from . import admission
+from .core import execute_database_query
+
+# 프로필 설정 파일 경로를 지정하는 환경 변수 (JSON 문자열을 직접 지정할 수도 있음)
+PROFILES_ENV = "MCP_DB_PROFILES"
+DEFAULT_PROFILES_PATH = "db_profiles.json"
+
+# 데이터베이스 유형별 기본 상태 확인 쿼리
+DEFAULT_HEALTH_CHECKS = {
+    "mysql": "SELECT 1",
+    "postgresql": "SELECT 1",
+    "oracle": "SELECT 1 FROM DUAL",
+    "mongodb": '{"ping": 1}',
+    "redis": "PING"
+}
+
+# 데이터베이스 유형별 드라이버 모듈 (핸들러가 처음 호출될 때 import 되는 모듈)
+DRIVER_MODULES = {
+    "mysql": "mysql.connector",
+    "postgresql": "psycopg2",
+    "oracle": "cx_Oracle",
+    "mongodb": "pymongo",
+    "redis": "redis"
+}
+
+_lock = threading.Lock()
+_profiles: Dict[str, Dict[str, Any]] = {}
+_status: Dict[str, Dict[str, Any]] = {}
+
+
+def _resolve_env(name: str, connection_params: Dict[str, Any]) -> Dict[str, Any]:
+    """'<키>_env' 항목을 환경 변수 값으로 치환 (예: password_env -> password)"""
+    resolved = {}
+
+    for key, value in connection_params.items():
+        if key.endswith("_env"):
+            # 나중에 알기 어려운 인증 오류가 나지 않도록 로드 시점에 바로 실패
+            if value not in os.environ:
+                raise ValueError(f"Profile '{name}': environment variable '{value}' for {key} is not set")
+            resolved[key[:-len("_env")]] = os.environ[value]
+        else:
+            resolved[key] = value
+
+    return resolved
+
+
+def load_profiles(path: Optional[str] = None, default_path: str = DEFAULT_PROFILES_PATH) -> Dict[str, Dict[str, Any]]:
+    """
+    연결 프로필을 로드합니다.
+
+    설정 형식:
+        {
+            "<프로필 이름>": {
+                "db_type": "postgresql",
+                "connection_params": {"host": "...", "user": "...", "password_env": "DB_PASSWORD"},
+                "options": {...},           # 선택 사항, 요청 옵션의 기본값
+                                            # (max_concurrency 등 제한 항목은 대상 서버의 제한으로 적용)
+                "warmup": true,             # 선택 사항, 시작 시 예열 여부 (기본값 true)
+                "health_check": "SELECT 1"  # 선택 사항, null이면 상태 확인 생략
+            }
+        }
+
+    Args:
+        path: 설정 파일 경로 (없으면 MCP_DB_PROFILES 환경 변수, 그 다음 default_path)
+        default_path: 기본 설정 파일 경로
+
+    Returns:
+        로드된 프로필 딕셔너리
+
+    Raises:
+        ValueError: db_type이 없거나 '<키>_env'로 지정한 환경 변수가 없는 경우,
+            제한 설정이 올바르지 않거나 같은 대상 서버에 서로 다른 제한을 지정한 경우
+    """
+    source = path or os.environ.get(PROFILES_ENV, default_path)
+
+    if source.lstrip().startswith("{"):
+        config = json.loads(source)
+    elif os.path.exists(source):
+        with open(source, encoding="utf-8") as f:
+            config = json.load(f)
+    else:
+        config = {}
+
+    profiles = {}
+    for name, profile in config.items():
+        if "db_type" not in profile:
+            raise ValueError(f"Profile '{name}' is missing db_type")
+
+        profiles[name] = {
+            "db_type": profile["db_type"].lower(),
+            "connection_params": _resolve_env(name, profile.get("connection_params", {})),
+            "options": profile.get("options", {}),
+            "warmup": profile.get("warmup", True),
+            "health_check": profile.get("health_check", DEFAULT_HEALTH_CHECKS.get(profile["db_type"].lower()))
+        }
+
+    # 프로필 옵션의 제한 항목은 요청이 아닌 서버 설정으로서 대상 서버에 적용
+    limits: Dict[str, Dict[str, Any]] = {}
+    for name, profile in profiles.items():
+        profile_limits = {k: v for k, v in profile["options"].items() if k in admission.DEFAULT_LIMITS}
+        if not profile_limits:
+            continue
+
+        key = admission.target_key(profile["db_type"], profile["connection_params"])
+        try:
+            profile_limits = admission.validate_limits(profile_limits)
+        except ValueError as e:
+            raise ValueError(f"Profile '{name}': {e}")
+        if key in limits and limits[key] != profile_limits:
+            raise ValueError(f"Profile '{name}': limits for {key} differ from another profile")
+        limits[key] = profile_limits
+
+    admission.configure(limits)
+
+    with _lock:
+        _profiles.clear()
+        _profiles.update(profiles)
+        _status.clear()
+        for name, profile in profiles.items():
+            _status[name] = {"state": "pending" if profile["warmup"] else "cold"}
+
+    return profiles
+
+
+def resolve(
+    name: str,
+    options: Optional[Dict[str, Any]] = None
+) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+    """
+    프로필 이름으로 연결 정보를 찾습니다.
+
+    Args:
+        name: 프로필 이름
+        options: 요청 옵션 (프로필 옵션보다 우선)
+
+    Returns:
+        (db_type, connection_params, options) 튜플
+
+    Raises:
+        KeyError: 등록되지 않은 프로필인 경우
+    """
+    with _lock:
+        profile = _profiles.get(name)
+
+    if profile is None:
+        raise KeyError(f"Unknown connection profile: {name}")
+
+    merged_options = dict(profile["options"])
+    merged_options.update(options or {})
+
+    return profile["db_type"], dict(profile["connection_params"]), merged_options
+
+
+def _resolve_host(connection_params: Dict[str, Any]):
+    """DNS 조회를 미리 수행하여 이름 해석 오류를 확인하고 리졸버 캐시를 채움"""
+    if "connection_string" in connection_params:
+        parsed = urlsplit(connection_params["connection_string"])
+        # SRV 레코드는 드라이버가 직접 조회하므로 생략
+        if parsed.scheme.endswith("+srv"):
+            return
+        # 여러 호스트가 나열된 경우(host1:port1,host2:port2) 각각 조회
+        location = parsed.netloc.rsplit("@", 1)[-1]
+        hosts = [(h.rsplit(":", 1)[0], None) for h in location.split(",")]
+    else:
+        hosts = [(connection_params.get("host", "localhost"), connection_params.get("port"))]
+
+    for host, port in hosts:
+        socket.getaddrinfo(host, port)
+
+
+async def warmup(name: str):
+    """
+    프로필을 예열합니다. 드라이버 모듈을 import 하고, DNS를 조회한 뒤 상태 확인 쿼리를 실행합니다.
+    결과는 list_profiles()로 확인할 수 있습니다.
+    """
+    with _lock:
+        profile = _profiles[name]
+        _status[name] = {"state": "warming"}
+
+    started = time.monotonic()
+
+    try:
+        await anyio.to_thread.run_sync(importlib.import_module, DRIVER_MODULES[profile["db_type"]])
+        await anyio.to_thread.run_sync(_resolve_host, profile["connection_params"])
+
+        if profile["health_check"]:
+            result = json.loads(await execute_database_query(
+                profile["db_type"],
+                dict(profile["connection_params"]),
+                profile["health_check"],
+                None,
+                dict(profile["options"])
+            ))
+            if not result.get("success"):
+                raise RuntimeError(result.get("error", "Health check failed"))
+
+        status = {"state": "ready"}
+    except Exception as e:
+        status = {"state": "failed", "error": str(e), "error_type": type(e).__name__}
+
+    status["elapsed_ms"] = round((time.monotonic() - started) * 1000, 1)
+
+    with _lock:
+        _status[name] = status
+
+
+async def warmup_all():
+    """예열 대기 중인 모든 프로필을 동시에 예열 (서버의 이벤트 루프에서 실행)"""
+    with _lock:
+        names = [name for name, status in _status.items() if status["state"] == "pending"]
+
+    async with anyio.create_task_group() as tg:
+        for name in names:
+            tg.start_soon(warmup, name)
+
+    with _lock:
+        states = [_status[name]["state"] for name in names if name in _status]
+
+    print(
+        f"Database profile warm-up: {states.count('ready')} ready, {states.count('failed')} failed",
+        file=sys.stderr
+    )
+
+
+def list_profiles() -> Dict[str, Dict[str, Any]]:
+    """인증 정보를 제외한 프로필 목록과 예열 상태를 반환"""
+    with _lock:
+        return {
+            name: {
+                "db_type": profile["db_type"],
+                "host": profile["connection_params"].get("host"),
+                "port": profile["connection_params"].get("port"),
+                "database": profile["connection_params"].get("database"),
+                "status": dict(_status.get(name, {}))
+            }
+            for name, profile in _profiles.items()
+        }
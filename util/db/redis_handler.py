@@ -1,5 +1,47 @@
 import json
-from typing import Dict, List, Any, Optional, Union
+import random
+import time
+from fnmatch import fnmatchcase
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Union
+
+from .serializer import ResultWriter, decode_bytes, serialize_rows
+
+def _connect(connection_params: Dict[str, Any], options: Dict[str, Any]):
+    """연결 정보로 Redis 클라이언트 생성"""
+    
+    import redis
+    
+    # 연결 파라미터 구성
+    host = connection_params.get("host", "localhost")
+    port = connection_params.get("port", 6379)
+    db = connection_params.get("database", 0)
+    password = connection_params.get("password", None)
+    
+    return redis.Redis(
+        host=host,
+        port=port,
+        db=db,
+        password=password,
+        socket_timeout=options["timeout"]
+    )
+
+def _is_network_error(e: Exception) -> bool:
+    """네트워크 수준의 연결 오류인지 확인 (AuthenticationError 등 인증 오류는 ConnectionError의 하위 클래스이므로 제외)"""
+    
+    import redis
+    
+    if isinstance(e, (redis.AuthenticationError, redis.exceptions.AuthorizationError)):
+        return False
+    return isinstance(e, (redis.ConnectionError, redis.TimeoutError))
+
+def _unique(items: Iterable[Any]) -> Iterator[Any]:
+    """이미 반환한 항목을 건너뛰며 순서대로 반환"""
+    
+    seen = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
 
 def handle_redis_query(connection_params: Dict[str, Any], query: str, params: Optional[Dict], options: Dict[str, Any]) -> str:
     """Redis 명령 실행 및 결과 반환"""
@@ -9,20 +51,8 @@ def handle_redis_query(connection_params: Dict[str, Any], query: str, params: Op
     client = None
     
     try:
-        # 연결 파라미터 구성
-        host = connection_params.get("host", "localhost")
-        port = connection_params.get("port", 6379)
-        db = connection_params.get("database", 0)
-        password = connection_params.get("password", None)
-        
         # Redis 연결
-        client = redis.Redis(
-            host=host,
-            port=port,
-            db=db,
-            password=password,
-            socket_timeout=options["timeout"]
-        )
+        client = _connect(connection_params, options)
         
         # 명령어 파싱
         try:
@@ -42,17 +72,8 @@ def handle_redis_query(connection_params: Dict[str, Any], query: str, params: Op
                 
             value = client.get(args[0])
             
-            # 바이너리 데이터를 문자열로 변환
-            if value is not None and isinstance(value, bytes):
-                try:
-                    value = value.decode('utf-8')
-                except UnicodeDecodeError:
-                    value = str(value)
-                    
-            return json.dumps({
-                "success": True,
-                "result": value
-            })
+            # 긴 값은 max_field_length와 max_bytes에 맞게 자른 뒤 문자열로 변환
+            return ResultWriter(options).value_response({"success": True}, "result", value)
             
         elif command == "SET":
             if len(args) < 2:
@@ -121,81 +142,202 @@ def handle_redis_query(connection_params: Dict[str, Any], query: str, params: Op
                 return json.dumps({"success": False, "error": "KEYS command requires exactly one pattern"})
                 
             pattern = args[0]
-            keys = client.keys(pattern)
-            
-            # 바이너리 데이터를 문자열로 변환
-            str_keys = []
-            for key in keys:
-                if isinstance(key, bytes):
-                    try:
-                        str_keys.append(key.decode('utf-8'))
-                    except UnicodeDecodeError:
-                        str_keys.append(str(key))
-                else:
-                    str_keys.append(str(key))
-                    
-            return json.dumps({
-                "success": True,
-                "keys": str_keys
-            })
+            
+            # 서버를 막는 KEYS 대신 SCAN으로 조금씩 가져오며 바이트 예산에 도달하면 중단
+            # SCAN은 같은 키를 여러 번 반환할 수 있으므로 중복 제거
+            keys = _unique(client.scan_iter(match=pattern, count=1000))
+            
+            return serialize_rows(keys, options, key="keys")
             
         elif command == "HGETALL":
             if len(args) != 1:
                 return json.dumps({"success": False, "error": "HGETALL command requires exactly one key"})
                 
-            result = client.hgetall(args[0])
-            
-            # 바이너리 데이터를 문자열로 변환
-            str_result = {}
-            for k, v in result.items():
-                key = k.decode('utf-8') if isinstance(k, bytes) else str(k)
+            # HSCAN으로 필드를 조금씩 가져오며 바이트 예산에 도달하면 중단
+            # HSCAN은 같은 필드를 여러 번 반환할 수 있으므로 중복 제거
+            writer = ResultWriter(options)
+            count = 0
+            seen = set()
+            for field, value in client.hscan_iter(args[0], count=1000):
+                if field in seen:
+                    continue
+                seen.add(field)
                 
-                if isinstance(v, bytes):
-                    try:
-                        value = v.decode('utf-8')
-                    except UnicodeDecodeError:
-                        value = str(v)
-                else:
-                    value = str(v)
-                    
-                str_result[key] = value
+                if not writer.add_item(field, value):
+                    break
+                count += 1
                 
-            return json.dumps({
-                "success": True,
-                "result": str_result
-            })
+            return writer.response({"success": True, "count": count}, "result", as_object=True)
             
         else:
             # 기타 명령은 redis-py의 execute_command를 사용하여 실행
             result = client.execute_command(command, *args)
             
             # 결과 타입에 따른 변환
-            if isinstance(result, bytes):
-                try:
-                    result = result.decode('utf-8')
-                except UnicodeDecodeError:
-                    result = str(result)
-            elif isinstance(result, list):
-                decoded_result = []
-                for item in result:
-                    if isinstance(item, bytes):
-                        try:
-                            decoded_result.append(item.decode('utf-8'))
-                        except UnicodeDecodeError:
-                            decoded_result.append(str(item))
-                    else:
-                        decoded_result.append(item)
-                result = decoded_result
+            if isinstance(result, list):
+                return serialize_rows(result, options, key="result")
                 
-            return json.dumps({
-                "success": True,
-                "result": result
-            })
+            writer = ResultWriter(options)
+            
+            if isinstance(result, dict):
+                # CONFIG GET 등 딕셔너리 결과는 항목 단위로 바이트 예산 적용
+                count = 0
+                for field, value in result.items():
+                    if not writer.add_item(field, value):
+                        break
+                    count += 1
+                return writer.response({"success": True, "count": count}, "result", as_object=True)
+                
+            return writer.value_response({"success": True}, "result", result)
             
     except Exception as e:
         return json.dumps({
             "success": False,
-            "error": str(e)
+            "error": str(e),
+            "connection_error": _is_network_error(e)
+        })
+        
+    finally:
+        if client:
+            client.close()
+
+# 구분자가 없는 키와 그룹 수 제한을 넘은 키를 모으는 그룹 이름
+NO_PREFIX_GROUP = "<no-prefix>"
+OVERFLOW_GROUP = "<other>"
+
+def _group_name(key: str, patterns: List[str], separator: str, depth: int) -> str:
+    """키가 속한 그룹 이름 (일치하는 패턴 또는 구분자 기준 접두사)"""
+    
+    for pattern in patterns:
+        if fnmatchcase(key, pattern):
+            return pattern
+            
+    # UUID, 해시 등 구분자가 없는 키는 키마다 그룹이 생기지 않도록 하나로 묶음
+    parts = key.split(separator)
+    if len(parts) == 1:
+        return NO_PREFIX_GROUP
+        
+    # 구분자 단위가 depth 이하인 키는 마지막 단위(보통 ID)를 제외한 접두사로 묶음
+    prefix_parts = parts[:min(depth, len(parts) - 1)]
+    return separator.join(prefix_parts) + separator + "*"
+
+def handle_redis_analyze(connection_params: Dict[str, Any], options: Dict[str, Any]) -> str:
+    """Redis 키스페이스를 SCAN으로 샘플링하여 키 패턴별 메모리 사용량 분석"""
+    
+    import redis
+    
+    client = None
+    
+    try:
+        client = _connect(connection_params, options)
+        
+        sample_rate = options["sample_rate"]
+        if not 0 < sample_rate <= 1:
+            return json.dumps({"success": False, "error": "sample_rate must be between 0 and 1"})
+            
+        started = time.monotonic()
+        deadline = started + options["time_budget"]
+        
+        groups = {}
+        cursor = options["cursor"]
+        scanned = 0
+        sampled = 0
+        missing = 0
+        overflow = 0
+        
+        while True:
+            # KEYS 대신 SCAN으로 조금씩 가져와 서버를 오래 막지 않도록 함
+            cursor, keys = client.scan(cursor=cursor, match=options["match"], count=options["batch_size"])
+            scanned += len(keys)
+            
+            if sample_rate < 1:
+                keys = [key for key in keys if random.random() < sample_rate]
+                
+            if keys:
+                # 키마다 왕복하지 않도록 TYPE/MEMORY USAGE/TTL을 한 번에 전송
+                pipe = client.pipeline(transaction=False)
+                for key in keys:
+                    pipe.type(key)
+                    pipe.memory_usage(key)
+                    pipe.ttl(key)
+                # MEMORY USAGE가 비활성화되었거나 ACL로 거부된 경우 등 명령 오류는
+                # 만료된 키와 구분하기 위해 그대로 예외로 전달하여 분석을 실패로 처리
+                replies = pipe.execute()
+                
+                for i, key in enumerate(keys):
+                    key_type, size, ttl = replies[i * 3:i * 3 + 3]
+                    
+                    # SCAN 이후 만료/삭제된 키는 제외
+                    if size is None:
+                        missing += 1
+                        continue
+                        
+                    sampled += 1
+                    name = decode_bytes(key)
+                    group_name = _group_name(name, options["patterns"], options["separator"], options["depth"])
+                    
+                    # 그룹 수가 max_groups에 도달하면 새 그룹은 만들지 않고 한 곳에 모음
+                    if group_name not in groups and len(groups) >= options["max_groups"]:
+                        group_name = OVERFLOW_GROUP
+                        overflow += 1
+                    elif group_name == OVERFLOW_GROUP:
+                        overflow += 1
+                        
+                    group = groups.setdefault(
+                        group_name,
+                        {"count": 0, "bytes": 0, "with_ttl": 0, "types": {}, "largest_key": None, "largest_key_bytes": 0}
+                    )
+                    
+                    group["count"] += 1
+                    group["bytes"] += size
+                    if isinstance(ttl, int) and ttl >= 0:
+                        group["with_ttl"] += 1
+                        
+                    key_type = decode_bytes(key_type) if isinstance(key_type, bytes) else str(key_type)
+                    group["types"][key_type] = group["types"].get(key_type, 0) + 1
+                    
+                    if size > group["largest_key_bytes"]:
+                        group["largest_key"] = name
+                        group["largest_key_bytes"] = size
+                        
+            # 전체를 훑었거나 시간 예산을 모두 쓴 경우 중단
+            if cursor == 0 or time.monotonic() >= deadline:
+                break
+                
+        # 샘플링 비율로 전체 규모 추정
+        result_groups = []
+        for name, group in groups.items():
+            group["pattern"] = name
+            group["avg_bytes"] = round(group["bytes"] / group["count"], 1)
+            group["estimated_count"] = round(group["count"] / sample_rate)
+            group["estimated_bytes"] = round(group["bytes"] / sample_rate)
+            result_groups.append(group)
+            
+        top_n = options["top_n"]
+        total_bytes = sum(group["bytes"] for group in result_groups)
+        
+        return json.dumps({
+            "success": True,
+            "complete": cursor == 0,
+            "cursor": cursor,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            "scanned_keys": scanned,
+            "sampled_keys": sampled,
+            "missing_keys": missing,
+            "overflow_keys": overflow,
+            "sample_rate": sample_rate,
+            "group_count": len(result_groups),
+            "total_bytes": total_bytes,
+            "estimated_total_bytes": round(total_bytes / sample_rate),
+            "top_by_bytes": sorted(result_groups, key=lambda g: g["bytes"], reverse=True)[:top_n],
+            "top_by_count": sorted(result_groups, key=lambda g: g["count"], reverse=True)[:top_n]
+        })
+        
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "error": str(e),
+            "connection_error": _is_network_error(e)
         })
         
     finally:
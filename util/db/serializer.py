@@ -0,0 +1,247 @@
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+# 한 번에 커서에서 가져오는 행 수
+FETCH_BATCH_SIZE = 100
+
+
+def decode_bytes(value: Any) -> str:
+    """바이너리 데이터를 문자열로 변환 (UTF-8이 아니면 repr 문자열 사용)"""
+    try:
+        return bytes(value).decode('utf-8')
+    except UnicodeDecodeError:
+        return str(bytes(value))
+
+
+def _default(value: Any) -> Any:
+    """JSON으로 직접 변환할 수 없는 값(BLOB, 날짜, Decimal 등)을 문자열로 변환"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return decode_bytes(value)
+    return str(value)
+
+
+def iter_cursor(cursor, max_rows: int, batch_size: int = FETCH_BATCH_SIZE) -> Iterator[Any]:
+    """
+    DB-API 커서에서 최대 max_rows개의 행을 배치 단위로 가져옵니다.
+    소비하는 쪽에서 중단하면 이후 배치는 가져오지 않습니다.
+    """
+    remaining = max_rows
+
+    while remaining > 0:
+        rows = cursor.fetchmany(min(batch_size, remaining))
+        if not rows:
+            return
+
+        for row in rows:
+            yield row
+        remaining -= len(rows)
+
+
+class ResultWriter:
+    """
+    결과 항목을 하나씩 JSON으로 직렬화하면서 바이트 예산(max_bytes)과
+    필드 길이 제한(max_field_length)을 적용합니다.
+    """
+
+    def __init__(self, options: Dict[str, Any]):
+        self.max_bytes = options.get("max_bytes")
+        self.max_field_length = options.get("max_field_length")
+        self.parts = []
+        self.bytes = 2  # 배열/객체를 감싸는 괄호
+        self.max_bytes_reached = False
+        self.truncated_fields = 0
+        self.truncated_field_bytes = 0
+        self.skipped_item = None
+
+    def truncate(self, value: Any) -> Any:
+        """
+        max_field_length(문자 수)보다 긴 문자열/바이너리 값을 잘라냄 (중첩 구조 포함)
+        잘려 나간 양은 UTF-8 바이트 수로 집계합니다.
+        """
+        if not self.max_field_length:
+            return value
+
+        if isinstance(value, dict):
+            return {k: self.truncate(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.truncate(v) for v in value]
+
+        # 멀티바이트 문자가 중간에 잘리지 않도록 바이너리는 문자열로 변환한 뒤 자름
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            value = decode_bytes(value)
+
+        if isinstance(value, str) and len(value) > self.max_field_length:
+            truncated = value[:self.max_field_length]
+            self.truncated_fields += 1
+            self.truncated_field_bytes += len(value.encode('utf-8')) - len(truncated.encode('utf-8'))
+            value = truncated
+
+        return value
+
+    def _append(self, encoded: str, truncated: tuple) -> bool:
+        # json.dumps는 ASCII만 출력하므로 문자열 길이가 곧 바이트 수
+        size = len(encoded) + (2 if self.parts else 0)  # 구분자 ", "
+
+        if self.max_bytes and self.bytes + size > self.max_bytes:
+            # 반환되지 않는 항목의 필드 잘림은 집계하지 않음
+            self.truncated_fields, self.truncated_field_bytes = truncated
+            self.max_bytes_reached = True
+            return False
+
+        self.parts.append(encoded)
+        self.bytes += size
+        return True
+
+    def add(self, value: Any) -> bool:
+        """
+        배열 항목을 추가합니다.
+
+        Returns:
+            추가된 경우 True, 바이트 예산을 초과하여 추가하지 못한 경우 False
+        """
+        truncated = (self.truncated_fields, self.truncated_field_bytes)
+        value = self.truncate(value)
+        encoded = json.dumps(value, default=_default)
+
+        if self._append(encoded, truncated):
+            return True
+
+        self.skipped_item = {"bytes": len(encoded)}
+        if isinstance(value, dict) and value:
+            # 예산을 넘긴 항목에서 가장 큰 필드를 알려 max_field_length 등을 조정할 수 있도록 함
+            sizes = {k: len(json.dumps(v, default=_default)) for k, v in value.items()}
+            largest = max(sizes, key=sizes.get)
+            self.skipped_item["largest_field"] = str(largest)
+            self.skipped_item["largest_field_bytes"] = sizes[largest]
+        return False
+
+    def add_item(self, key: Any, value: Any) -> bool:
+        """객체 항목을 추가합니다. 반환값은 add와 같습니다."""
+        if isinstance(key, (bytes, bytearray)):
+            key = decode_bytes(key)
+        truncated = (self.truncated_fields, self.truncated_field_bytes)
+        encoded = json.dumps(str(key)) + ": " + json.dumps(self.truncate(value), default=_default)
+
+        if self._append(encoded, truncated):
+            return True
+
+        self.skipped_item = {"bytes": len(encoded), "largest_field": str(key), "largest_field_bytes": len(encoded)}
+        return False
+
+    def _fit(self, value: Any) -> Any:
+        """
+        문자열/바이너리 값을 JSON으로 직렬화했을 때 max_bytes 안에 들도록 잘라냄
+        큰 바이너리 값은 예산에 필요한 앞부분만 문자열로 변환합니다.
+        """
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            raw = bytes(value)
+            size = len(raw)
+            if size <= self.max_bytes:
+                text = decode_bytes(raw)
+            else:
+                # 각 바이트는 JSON에서 1바이트 이상을 차지하므로 max_bytes 이후는 필요 없음
+                # 잘린 멀티바이트 문자는 증분 디코더가 버림
+                try:
+                    text = codecs.getincrementaldecoder('utf-8')().decode(raw[:self.max_bytes])
+                except UnicodeDecodeError:
+                    text = str(raw[:self.max_bytes])
+        elif isinstance(value, str):
+            text = value
+            size = None
+        else:
+            return value
+
+        # 문자열 길이로 먼저 걸러 큰 값 전체를 다시 직렬화하지 않도록 함
+        if (size is None or size <= self.max_bytes) and len(text) <= self.max_bytes \
+                and len(json.dumps(text)) <= self.max_bytes:
+            return text
+
+        cut = text[:self.max_bytes]
+        encoded_size = len(json.dumps(cut))
+        while cut and encoded_size > self.max_bytes:
+            # 이스케이프되는 문자 비율만큼 줄여 가며 예산에 맞춤
+            cut = cut[:min(len(cut) - 1, len(cut) * self.max_bytes // encoded_size)]
+            encoded_size = len(json.dumps(cut))
+
+        if size is None:
+            size = len(text.encode('utf-8'))
+        self.max_bytes_reached = True
+        self.truncated_fields += 1
+        self.truncated_field_bytes += max(0, size - len(cut.encode('utf-8')))
+        return cut
+
+    def value_response(self, fields: Dict[str, Any], key: str, value: Any) -> str:
+        """
+        단일 값을 key로 담은 JSON 응답 문자열을 생성합니다.
+        max_bytes를 넘는 문자열/바이너리 값은 예산에 맞게 잘라내고 max_bytes_reached로 알립니다.
+        """
+        value = self.truncate(value)
+        if self.max_bytes:
+            value = self._fit(value)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            value = decode_bytes(value)
+
+        encoded = json.dumps(value, default=_default)
+        self.bytes = len(encoded)
+
+        head = json.dumps({**fields, **self.summary()}, default=_default)
+        return head[:-1] + ", " + json.dumps(key) + ": " + encoded + "}"
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        반환된 바이트 수와 잘린 항목 정보를 반환
+        예산을 넘겨 반환하지 못한 첫 항목이 있으면 skipped_item에 그 크기와 가장 큰 필드를 담습니다.
+        """
+        summary = {
+            "result_bytes": self.bytes,
+            "max_bytes_reached": self.max_bytes_reached,
+            "truncated_fields": self.truncated_fields,
+            "truncated_field_bytes": self.truncated_field_bytes
+        }
+        if self.skipped_item is not None:
+            summary["skipped_item"] = self.skipped_item
+        return summary
+
+    def response(self, fields: Dict[str, Any], key: str, as_object: bool = False) -> str:
+        """
+        fields와 직렬화된 항목을 key로 묶은 JSON 응답 문자열을 생성합니다.
+        """
+        body = ", ".join(self.parts)
+        body = "{" + body + "}" if as_object else "[" + body + "]"
+
+        head = json.dumps({**fields, **self.summary()}, default=_default)
+        return head[:-1] + ", " + json.dumps(key) + ": " + body + "}"
+
+
+def serialize_rows(
+    rows: Iterable[Any],
+    options: Dict[str, Any],
+    key: str = "results",
+    max_rows: Optional[int] = None
+) -> str:
+    """
+    행을 바이트 예산 안에서 직렬화하고, 예산에 도달하면 더 이상 행을 가져오지 않습니다.
+
+    Args:
+        rows: 결과 행 이터레이터
+        options: max_bytes, max_field_length 옵션
+        key: 결과 목록을 담을 키
+        max_rows: 최대 행 수 (지정하면 max_rows_reached 포함)
+
+    Returns:
+        쿼리 실행 결과 (JSON 문자열)
+    """
+    writer = ResultWriter(options)
+    count = 0
+
+    for row in rows:
+        if not writer.add(row):
+            break
+        count += 1
+
+    fields = {"success": True, "count": count}
+    if max_rows is not None:
+        fields["max_rows_reached"] = count >= max_rows
+
+    return writer.response(fields, key)
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+import anyio
+
+# 결과를 변경하지 않는 Redis 명령어 목록
+READ_ONLY_REDIS_COMMANDS = {
+    "GET", "MGET", "EXISTS", "KEYS", "HGET", "HGETALL", "HKEYS", "HVALS", "HLEN",
+    "LRANGE", "LLEN", "SMEMBERS", "SCARD", "ZRANGE", "ZCARD", "ZSCORE",
+    "TTL", "PTTL", "TYPE", "STRLEN", "DBSIZE", "INFO", "SCAN", "PING"
+}
+
+# 잠금을 걸거나 결과를 다른 곳에 기록하는 SELECT
+_SQL_SIDE_EFFECT = re.compile(
+    r"\bFOR\s+(UPDATE|SHARE|NO\s+KEY\s+UPDATE|KEY\s+SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b|\bINTO\b"
+)
+
+# 호출할 때마다 결과가 달라지거나 상태를 변경하는 함수
+_SQL_VOLATILE = re.compile(
+    r"\b(NEXTVAL|SETVAL|LASTVAL|CURRVAL|LAST_INSERT_ID|GET_LOCK|RELEASE_LOCK|"
+    r"PG_(TRY_)?ADVISORY\w*|SLEEP|PG_SLEEP|RAND|RANDOM|UUID\w*|GEN_RANDOM_UUID|SYS_GUID)\s*\("
+    r"|\.(NEXTVAL|CURRVAL)\b"
+)
+
+# 테이블을 조회하는 FROM 절 (Oracle의 FROM DUAL은 제외)
+_SQL_FROM = re.compile(r"\bFROM\b(?!\s+DUAL\b)")
+_SQL_CALL = re.compile(r"\w\s*\(")
+
+
+def _is_read_sql(query: str) -> bool:
+    """결과를 공유해도 안전한 SELECT인지 판별"""
+    query_upper = query.strip().upper()
+
+    # 핸들러와 동일하게 SELECT 쿼리만 읽기로 간주
+    if not query_upper.startswith("SELECT"):
+        return False
+
+    if _SQL_SIDE_EFFECT.search(query_upper) or _SQL_VOLATILE.search(query_upper):
+        return False
+
+    # 테이블 없이 함수만 호출하는 SELECT는 사용자 정의 함수의 부수 효과를 알 수 없으므로 제외
+    if not _SQL_FROM.search(query_upper) and _SQL_CALL.search(query_upper):
+        return False
+
+    return True
+
+
+class _Call:
+    """진행 중인 하나의 실행과 그 결과를 보관"""
+
+    def __init__(self):
+        self.done = anyio.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+# 모든 호출은 서버의 이벤트 루프에서 이루어지므로 별도의 잠금이 필요 없음
+_calls: Dict[str, _Call] = {}
+_stats = {
+    "executed": 0,   # 실제로 데이터베이스에서 실행된 호출 수
+    "coalesced": 0,  # 진행 중인 실행의 결과를 공유받은 호출 수
+    "in_flight": 0   # 현재 실행 중인 고유 쿼리 수
+}
+
+
+def is_read_query(db_type: str, query: str, params: Optional[Union[List, Dict]]) -> bool:
+    """
+    결과를 공유해도 안전한 읽기 전용 쿼리인지 판별합니다.
+
+    Args:
+        db_type: 데이터베이스 유형
+        query: 실행할 쿼리 또는 명령어
+        params: 쿼리 파라미터
+
+    Returns:
+        읽기 전용 쿼리인 경우 True, 그렇지 않으면 False
+
+    SQL은 SELECT 중에서도 다음은 제외합니다.
+        - FOR UPDATE/FOR SHARE/LOCK IN SHARE MODE 등 잠금을 거는 쿼리
+        - SELECT ... INTO 처럼 결과를 테이블/변수/파일에 기록하는 쿼리
+        - nextval, GET_LOCK, RAND 등 호출마다 결과가 달라지거나 상태를 바꾸는 함수를 사용하는 쿼리
+        - FROM 절 없이 함수만 호출하는 쿼리 (예: SELECT my_func())
+    """
+    db_type = db_type.lower()
+
+    if db_type in ["mysql", "postgresql", "oracle"]:
+        return _is_read_sql(query)
+
+    if db_type == "mongodb":
+        # 컬렉션 대상 find 명령만 읽기로 간주
+        if not (isinstance(params, dict) and params.get("collection")):
+            return False
+        try:
+            command = json.loads(query)
+        except (json.JSONDecodeError, TypeError):
+            return False
+        return isinstance(command, dict) and "find" in command
+
+    if db_type == "redis":
+        parts = query.strip().split()
+        return bool(parts) and parts[0].upper() in READ_ONLY_REDIS_COMMANDS
+
+    return False
+
+
+def make_key(
+    db_type: str,
+    connection_params: Dict[str, Any],
+    query: str,
+    params: Optional[Union[List, Dict]],
+    options: Dict[str, Any]
+) -> str:
+    """
+    동일한 요청을 식별하기 위한 키를 생성합니다.
+    비밀번호 등 연결 정보가 키에 그대로 남지 않도록 해시로 변환합니다.
+    """
+    payload = json.dumps(
+        [db_type.lower(), connection_params, query, params, options],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def do(key: str, fn: Callable[[], Awaitable[str]], timeout: Optional[float] = None) -> str:
+    """
+    같은 키로 진행 중인 실행이 있으면 그 결과를 기다려 공유하고,
+    없으면 fn을 실행한 뒤 결과를 대기 중인 호출들과 공유합니다.
+    결과를 기다리는 호출은 워커 스레드를 점유하지 않습니다.
+
+    Args:
+        key: 요청 식별 키
+        fn: 실제 실행 함수
+        timeout: 진행 중인 실행의 결과를 기다리는 최대 시간(초) (None이면 선행 실행이 끝날 때까지 대기)
+
+    Returns:
+        실행 결과 (JSON 문자열)
+
+    Raises:
+        TimeoutError: timeout 안에 진행 중인 실행이 끝나지 않은 경우
+    """
+    call = _calls.get(key)
+
+    if call is not None:
+        _stats["coalesced"] += 1
+
+        with anyio.move_on_after(float("inf") if timeout is None else timeout):
+            await call.done.wait()
+        if not call.done.is_set():
+            raise TimeoutError("Timed out waiting for an identical in-flight query")
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    call = _Call()
+    _calls[key] = call
+    _stats["executed"] += 1
+    _stats["in_flight"] += 1
+
+    try:
+        call.result = await fn()
+    except anyio.get_cancelled_exc_class():
+        # 선행 호출이 취소되어도 대기 중인 호출까지 취소 예외를 받지 않도록 함
+        call.error = RuntimeError("Identical in-flight query was cancelled")
+        raise
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        # 결과가 정해진 뒤 키를 제거하여 이후 요청은 새로 실행되도록 함
+        del _calls[key]
+        _stats["in_flight"] -= 1
+        call.done.set()
+
+    return call.result
+
+
+def get_stats() -> Dict[str, int]:
+    """중복 제거 통계를 반환"""
+    return dict(_stats)